@@ -2,9 +2,10 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.alert import Alert
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_policy import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from utils.waits import wait_until_settled
 import time
 
 class BridgePage:
@@ -107,7 +108,7 @@ class BridgePage:
         self.browser.find_element(*self.stellar_address).send_keys(Keys.CONTROL + "a")
         self.browser.find_element(*self.stellar_address).send_keys(Keys.DELETE)
         self.browser.find_element(*self.stellar_address).send_keys(data)
-        time.sleep(2)
+        wait_until_settled(self.browser)
         return self.browser.find_element(*self.submit_button).is_enabled()
 
     def check_withdraw_tft_amount(self, data):
@@ -115,14 +116,14 @@ class BridgePage:
         self.browser.find_element(*self.amount_tft).send_keys(Keys.DELETE)
         self.browser.find_element(*self.amount_tft).send_keys(data)
         WebDriverWait(self.browser, 30).until(EC.element_to_be_clickable(self.submit_button))
-        time.sleep(2)
+        wait_until_settled(self.browser)
         return self.browser.find_element(*self.submit_button).is_enabled()
 
     def check_withdraw_invalid_tft_amount(self, data):
         self.browser.find_element(*self.amount_tft).send_keys(Keys.CONTROL + "a")
         self.browser.find_element(*self.amount_tft).send_keys(Keys.DELETE)
         self.browser.find_element(*self.amount_tft).send_keys(data)
-        time.sleep(2)
+        wait_until_settled(self.browser)
         return self.browser.find_element(*self.submit_button).is_enabled()
 
     def check_withdraw(self, address, amount):
@@ -155,7 +156,7 @@ class BridgePage:
                     time.sleep(0.5)
         return new_balance
     
-    def get_balance_withdraw(self, balance):
+    def get_balance_withdraw(self, balance, timeout=60):
         while True:
             try:
                 new_balance = self.browser.find_element(*self.balance_text).text[:-4]
@@ -165,7 +166,11 @@ class BridgePage:
         self.browser.refresh()
         # alert = Alert(self.browser)
         # alert.accept()
+        deadline = time.monotonic() + timeout
         while(new_balance==balance):
+            if time.monotonic() > deadline:
+                raise TimeoutException("The balance is still " + balance + " after " + str(timeout) + " seconds")
+            wait_until_settled(self.browser)
             while True:
                 try:
                     new_balance = self.browser.find_element(*self.balance_text).text[:-4]
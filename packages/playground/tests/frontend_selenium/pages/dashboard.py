@@ -2,10 +2,12 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.alert import Alert
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_policy import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException
 from utils.base import Base
+from utils.waits import wait_until_settled
+from utils.forms import fill_form
 import time
 
 class DashboardPage:
@@ -60,7 +62,7 @@ class DashboardPage:
     def open_and_load(self):
         self.browser.get(Base.base_url)
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.profile_load_label))
-        time.sleep(5)
+        wait_until_settled(self.browser)
     
     def press_esc_key(self):
         webdriver.ActionChains(self.browser).send_keys(Keys.ESCAPE).perform()
@@ -72,20 +74,12 @@ class DashboardPage:
         if(validation):
             WebDriverWait(self.browser, 30).until(EC.element_to_be_clickable(self.email_input))
 
-    def connect_your_wallet(self, email, password):
-        self.browser.find_element(*self.email_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.email_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.email_input).send_keys(email)
-        self.browser.find_element(*self.password_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.password_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.password_input).send_keys(password)
-        self.browser.find_element(*self.confirm_password_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.confirm_password_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.confirm_password_input).send_keys(password)
+    def connect_your_wallet(self, email, password, keystrokes=False):
+        fill_form(self.browser, {self.email_input: email, self.password_input: password, self.confirm_password_input: password}, keystrokes)
         return self.browser.find_element(*self.connect_button)
 
     def logout_account(self):
-        time.sleep(3)
+        wait_until_settled(self.browser)
         while True:
             try:
                 self.wait_for_button(self.browser.find_element(*self.logout_button)).click()
@@ -176,7 +170,7 @@ class DashboardPage:
         self.browser.find_element(*self.profile_button).click()
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.qr_code_img))
         WebDriverWait(self.browser, 30).until(EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'TFChain Wallet')]")))
-        time.sleep(3)
+        wait_until_settled(self.browser)
     
     def get_link(self):
         WebDriverWait(self.browser, 30).until(EC.number_of_windows_to_be(2))
@@ -202,7 +196,7 @@ class DashboardPage:
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.learn_about_grid_button))
         webdriver.ActionChains(self.browser).send_keys(Keys.END).perform()
         webdriver.ActionChains(self.browser).send_keys(Keys.PAGE_DOWN).perform()
-        time.sleep(3)
+        wait_until_settled(self.browser)
         self.browser.find_element(*self.learn_about_grid_button).click()
         return self.get_link()
     
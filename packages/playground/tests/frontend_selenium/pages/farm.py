@@ -1,9 +1,11 @@
-from time import sleep
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_policy import WebDriverWait, expect_not_visible
 from selenium.webdriver.support import expected_conditions as EC
+from utils.waits import wait_until_settled
+from utils.table import DataTable, read_fields
+from utils.grid_proxy import GridProxy
 
 class FarmPage:
 
@@ -46,7 +48,7 @@ class FarmPage:
     range_selection = (By.XPATH, "//div[@class='v-list-item-title'][text()='Range']")
     from_ip_input = (By.XPATH, "//label[text()='From IP']/following-sibling::input") 
     to_ip_input = (By.XPATH, "//label[text()='To IP']/following-sibling::input")
-    table_row = '//*[@id="app"]/div[1]/div[2]/div/div[1]/div[4]/div[1]/table/tbody/tr['
+    table_rows = '//*[@id="app"]/div[1]/div[2]/div/div[1]/div[4]/div[1]/table/tbody/tr'
     farm_public_ips = '//table/tbody/tr[2]/td/div[2]/div/div[1]/div/div[2]/table/tbody/tr'
     node_expand_details = '//table/tbody/tr[1]/td'
     rows_per_page = (By.XPATH, '//*[@id="app"]/div[1]/div[2]/div/div[1]/div[4]/div[2]/div[1]/div/div/div/div[1]/div[2]/div/i')
@@ -54,6 +56,9 @@ class FarmPage:
     close_login_button = (By.XPATH, '/html/body/div[1]/div[3]/div/div/div[4]/button[2]')
 
 
+    # Confirmations of the writes changing the grid proxy data
+    writes = ('Farm created successfully', 'Farm created!', 'Address Added successfully!', 'IP is added successfully.', 'IP is deleted successfully!')
+
     def __init__(self, browser):
         self.browser = browser
 
@@ -65,7 +70,7 @@ class FarmPage:
     
     def check_farm_counts(self):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.table_farm_name))
-        table = self.browser.find_elements(*self.table)
+        table = self.browser.find_elements(*self.table, settled=True)
         return len(table)
 
     def create_farm(self, farm_name):
@@ -76,6 +81,7 @@ class FarmPage:
     def create_farm_invalid_name(self, data):
         self.browser.find_element(*self.farm_name_text_field).send_keys(Keys.CONTROL + "a")
         self.browser.find_element(*self.farm_name_text_field).send_keys(Keys.DELETE)
+        # The farm name is validated on every keystroke, so it is the one field typed key by key
         for char in data:
             self.browser.find_element(*self.farm_name_text_field).send_keys(char)
 
@@ -83,14 +89,14 @@ class FarmPage:
         tries = 3
         table = 'No data available'
         while('No data available' in table and tries > 0):
-            sleep(5)
+            wait_until_settled(self.browser)
             self.browser.find_element(*self.search_bar).send_keys(Keys.CONTROL + "a")
             self.browser.find_element(*self.search_bar).send_keys(Keys.DELETE)
-            for char in farm_name:
-                self.browser.find_element(*self.search_bar).send_keys(char)
+            self.browser.find_element(*self.search_bar).send_keys(farm_name)
+            # Read the table once the search request is answered and rendered
+            wait_until_settled(self.browser)
             table = self.browser.find_element(*self.table).text
             tries -= 1
-            sleep(5)
             if table.count('NotCertified')>1:
                 continue
             if farm_name in table:
@@ -98,13 +104,12 @@ class FarmPage:
         return table
     
     def search_functionality_invalid_name(self, farm_name):
-        sleep(2)
+        wait_until_settled(self.browser)
         self.browser.find_element(*self.search_bar).send_keys(Keys.CONTROL + "a")
         self.browser.find_element(*self.search_bar).send_keys(Keys.DELETE)
-        for char in farm_name:
-            self.browser.find_element(*self.search_bar).send_keys(char)
+        self.browser.find_element(*self.search_bar).send_keys(farm_name)
+        wait_until_settled(self.browser)
         table = self.browser.find_element(*self.table).text
-        sleep(3)
         return table
 
     def display_all_farms(self):
@@ -112,128 +117,67 @@ class FarmPage:
         self.browser.find_element(*self.rows_per_page).click()
         self.browser.find_element(*self.all_rows_per_page).click()
 
+    def read_column(self, index):
+        return DataTable(self.browser, self.table_rows).column(index)
+
     def farm_table_sorting_by_id(self):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.table_farm_name))
-        id=[]
-        table = self.browser.find_elements(*self.table)
-        for i in range(1,len(table)+1):
-            element=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[2]").text)
-            id.append(int(element))
-        id.sort()
+        table = DataTable(self.browser, self.table_rows).rows()
+        id = sorted(int(row[1]) for row in table)
         self.browser.find_element(*self.farm_Id_arrow).click()
-        sorted=[]
-        table = self.browser.find_elements(*self.table)
-        for i in range (1,len(table)+1):
-            index=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[2]").text)
-            sorted.append(int(index))
-        return id,sorted,table
+        return id, [int(cell) for cell in self.read_column(1)], table
     
     def farm_table_sorting_by_id_up(self,id,rows):    
         id.reverse()
-        sorted=[]
         self.browser.find_element(*self.farm_Id_arrow).click()
-        for i in range (1,len(rows)+1):
-            index1=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[2]").text)
-            sorted.append(int(index1))
-        return id,sorted
+        return id, [int(cell) for cell in self.read_column(1)]
 
     def farm_table_sorting_by_name(self):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.table_farm_name))      
-        name=[]
-        table = self.browser.find_elements(*self.table)
-        for i in range(1,len(table)+1):                                                                                       
-            element=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[3]").text)
-            element=element.upper()
-            name.append((element))
-        name.sort()
+        table = DataTable(self.browser, self.table_rows).rows()
+        name = sorted(row[2].upper() for row in table)
         self.browser.find_element(*self.farm_name_arrow).click()
-        sorted=[]
-        for i in range (1,len(table)+1):
-            index=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[3]").text)
-            index=index.upper()
-            sorted.append((index))
-        return name,sorted,table
+        return name, [cell.upper() for cell in self.read_column(2)], table
 
     def farm_sorting_name_up(self,name,table):  
         name.reverse()
-        sorted=[]
         self.browser.find_element(*self.farm_name_arrow).click()
-        for i in range (1,len(table)+1):
-            index1=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[3]").text)
-            index1=index1.upper()
-            sorted.append((index1))
-        return name,sorted
+        return name, [cell.upper() for cell in self.read_column(2)]
 
     def farm_table_sorting_by_twin_id(self):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.table_farm_name)) 
-        id=[]
-        table = self.browser.find_elements(*self.table)
-        for i in range(1,len(table)+1):                                                                                       
-            element=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[4]").text)
-            id.append(int(element))
-        id.sort()
+        table = DataTable(self.browser, self.table_rows).rows()
+        id = sorted(int(row[3]) for row in table)
         self.browser.find_element(*self.farm_twin_linked_arrow).click()
-        sorted=[]
-        for i in range (1,len(table)+1):
-            index=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[4]").text)
-            sorted.append(int(index))
-        return id,sorted,table   
+        return id, [int(cell) for cell in self.read_column(3)], table
     
     def farm_table_sorting_by_twin_id_up(self,id,table):
         id.reverse()
-        sorted=[]
         self.browser.find_element(*self.farm_twin_linked_arrow).click()
-        for i in range (1,len(table)+1):
-            index1=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[4]").text)
-            sorted.append(int(index1))
-        return id , sorted
+        return id, [int(cell) for cell in self.read_column(3)]
       
     def farm_table_sorting_by_cerification_type(self):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.table_farm_name))
-        name=[]
-        table = self.browser.find_elements(*self.table)
-        for i in range(1,len(table)+1):                                                                                       
-            element=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[5]").text)
-            name.append((element))
-        name.sort()
+        table = DataTable(self.browser, self.table_rows).rows()
+        name = sorted(row[4] for row in table)
         self.browser.find_element(*self.certification_type_arrow).click()
-        sorted=[]
-        for i in range (1,len(table)+1):
-            index=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[5]").text)
-            sorted.append((index))
-        return name ,sorted,table   
+        return name, self.read_column(4), table
 
     def  farm_table_sorting_by_cerification_type_up(self,name,table): 
         name.reverse()
-        sorted=[]
-        for i in range (1,len(table)+1):
-            index1=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[5]").text)
-            sorted.append((index1))
-        return name,sorted
+        return name, self.read_column(4)
 
     def farm_table_sorting_by_pp_id(self):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.table_farm_name))      
-        id=[]
-        table = self.browser.find_elements(*self.table)
-        for i in range(1,len(table)+1):                                                                                       
-            element=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[6]").text)
-            id.append(int(element))
-        id.sort()
+        table = DataTable(self.browser, self.table_rows).rows()
+        id = sorted(int(row[5]) for row in table)
         self.browser.find_element(*self.pricing_policy_arrow).click()
-        sorted=[]
-        for i in range (1,len(table)+1):
-            index=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[6]").text)
-            sorted.append(int(index))
-        return id,sorted,table
+        return id, [int(cell) for cell in self.read_column(5)], table
 
     def farm_table_sorting_by_pp_id_up(self,id,table):  
         id.reverse()
-        sorted=[]
         self.browser.find_element(*self.pricing_policy_arrow).click()
-        for i in range (1,len(table)+1):
-            index1=(self.browser.find_element(By.XPATH, f"{self.table_row}{str(i)}]/td[6]").text)
-            sorted.append(int(index1))
-        return id, sorted
+        return id, [int(cell) for cell in self.read_column(5)]
 
     def setup_farmpayout_address(self, farm_name):
         self.search_functionality(farm_name)
@@ -242,10 +186,10 @@ class FarmPage:
         WebDriverWait(self.browser, 30).until(EC.element_to_be_clickable(self.details_arrow))
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located((By.XPATH, "//span[contains(@class, 'v-btn__content')]/i[contains(@class, 'mdi-chevron-down')]")))
         self.browser.find_element(*self.details_arrow).click()
-        if(len(self.browser.find_elements(By.XPATH, "//span[contains(@class, 'v-btn__content')]/i[contains(@class, 'mdi-chevron-up')]")) == 0):
+        if(expect_not_visible(self.browser, (By.XPATH, "//span[contains(@class, 'v-btn__content')]/i[contains(@class, 'mdi-chevron-up')]"))):
             self.browser.find_element(*self.details_arrow).click()
         webdriver.ActionChains(self.browser).send_keys(Keys.PAGE_DOWN).perform()
-        sleep(10)
+        wait_until_settled(self.browser)
 
     def reopen_details(self):
         WebDriverWait(self.browser, 60).until(EC.visibility_of_element_located((By.XPATH, "//span[contains(@class, 'v-btn__content')]/i[contains(@class, 'mdi-chevron-down')]")))
@@ -328,24 +272,33 @@ class FarmPage:
         ip_len = 0
         gateway_len = 0
         if(ip):
-            ip_len = len(self.browser.find_elements(By.XPATH, "//td[contains(@class, 'v-data-table__td') and contains(@class, 'v-data-table-column--align-center') and text()='"+ ip +"']"))
+            ip_len = len(self.browser.find_elements(By.XPATH, "//td[contains(@class, 'v-data-table__td') and contains(@class, 'v-data-table-column--align-center') and text()='"+ ip +"']", settled=True))
         if(gateway):
-            gateway_len = len(self.browser.find_elements(By.XPATH, "//td[contains(@class, 'v-data-table__td') and contains(@class, 'v-data-table-column--align-center') and text()='"+ gateway +"']"))
+            gateway_len = len(self.browser.find_elements(By.XPATH, "//td[contains(@class, 'v-data-table__td') and contains(@class, 'v-data-table-column--align-center') and text()='"+ gateway +"']", settled=True))
         return ip_len, gateway_len
     
     def farm_detials(self):
+        fields = read_fields(self.browser, {
+            'farm_id': f"{self.node_expand_details}[1]",
+            'farm_name': f"{self.node_expand_details}[2]",
+            'twin_id': f"{self.node_expand_details}[3]",
+            'certification': f"{self.node_expand_details}[4]",
+            'stellar_address': self.stellar_payout_address[1],
+            'dedicated': self.dedicated[1],
+            'pricing_policy': self.pricing_policy[1],
+        })
         details = []
-        details.append(self.browser.find_element(By.XPATH,  f"{self.node_expand_details}[1]").text) # Farm ID
-        details.append(self.browser.find_element(By.XPATH,  f"{self.node_expand_details}[2]").text) # Farm Name
-        details.append(self.browser.find_element(By.XPATH,  f"{self.node_expand_details}[3]").text) # Linked Twin ID
-        details.append(self.browser.find_element(By.XPATH,  f"{self.node_expand_details}[4]").text) # Certification Type
-        details.append(self.browser.find_element(*self.stellar_payout_address).text) # Stellar Address
-        details.append(True if self.browser.find_element(*self.dedicated).text != "No" else False) # Dedicated
-        details.append(self.browser.find_element(*self.pricing_policy).text) # Pricing Policy
-        for i in range(len(self.browser.find_elements(By.XPATH, self.farm_public_ips))):
-            details.append(self.browser.find_element(By.XPATH,  f"{self.farm_public_ips}[{str(i+1)}]/td[2]").text) # IP
-            details.append(self.browser.find_element(By.XPATH,  f"{self.farm_public_ips}[{str(i+1)}]/td[4]").text) # Deployed Contract ID
-            details.append(self.browser.find_element(By.XPATH,  f"{self.farm_public_ips}[{str(i+1)}]/td[3]").text) # Gateway
+        details.append(fields['farm_id']) # Farm ID
+        details.append(fields['farm_name']) # Farm Name
+        details.append(fields['twin_id']) # Linked Twin ID
+        details.append(fields['certification']) # Certification Type
+        details.append(fields['stellar_address']) # Stellar Address
+        details.append(True if fields['dedicated'] != "No" else False) # Dedicated
+        details.append(fields['pricing_policy']) # Pricing Policy
+        for row in DataTable(self.browser, self.farm_public_ips).rows():
+            details.append(row[1]) # IP
+            details.append(row[3]) # Deployed Contract ID
+            details.append(row[2]) # Gateway
         return details
 
     def verify_the_availability_of_zero_os_bootstrap(self):
@@ -377,4 +330,7 @@ class FarmPage:
 
     def wait_for(self, keyword):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located((By.XPATH, "//*[contains(text(), '"+ keyword +"')]")))
+        if keyword in self.writes:
+            # The write is confirmed, the cached grid proxy data is stale from now on
+            GridProxy.invalidate('farms')
         return True
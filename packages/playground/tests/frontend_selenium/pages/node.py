@@ -1,8 +1,11 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_policy import WebDriverWait, WaitPolicy
 from selenium.webdriver.support import expected_conditions as EC
+from utils.table import DataTable, read_fields
+from utils.forms import fill_form
+from utils.grid_proxy import GridProxy
 
 class NodePage:
 
@@ -20,6 +23,9 @@ class NodePage:
     node_page = (By.XPATH , "//*[contains(text(), 'Your Nodes')]")
     search_node_input = (By.XPATH, '/html/body/div[1]/div[1]/div[3]/div/div/div[5]/div/div[1]/div/div[1]/div/input')
     node_table = (By.XPATH, "//span[text()='Node ID']/ancestor::table/tbody/tr")
+    # Rows holding a node, the empty table has a single 'No data available' cell instead
+    node_rows = (By.XPATH, "//span[text()='Node ID']/ancestor::table/tbody/tr[td[2]]")
+    no_data = (By.XPATH, "//span[text()='Node ID']/ancestor::table/tbody//td[contains(text(), 'No data available')]")
     node_id = (By.XPATH , "//*[contains(text(), 'Node ID')]")
     farm_id = (By.XPATH , '//*[@id="app"]/div[1]/div[2]/div/div[1]/div[5]/div[2]/div[1]/div[1]/table/thead/tr/th[3]')
     country = (By.XPATH , "//*[contains(text(), 'Country')]")
@@ -40,7 +46,30 @@ class NodePage:
     set_btn = (By.XPATH, "//button[.//span[text()='Save']]")
     fee_id = (By.XPATH , "//*[contains(text(), 'Additional fees will be added to your node')]")
     table_xpath = "//span[text()='Node ID']/ancestor::table/tbody/tr"
-
+    # Fields of the public config dialog
+    config_fields = {'id': id_label, 'ipv4': ipv4, 'ipv4_gateway': ipv4_gateway, 'ipv6': ipv6, 'ipv6_gateway': ipv6_gateway, 'domain': domain}
+    # Fields of the expanded node panel, relative to its cell
+    detail_fields = {
+        'node_id': 'div[1]/div[3]/div/div/div[1]/div[2]/p',
+        'farm_id': 'div[1]/div[3]/div/div/div[2]/div[2]/p',
+        'twin_id': 'div[1]/div[3]/div/div/div[3]/div[2]/p',
+        'certification': 'div[1]/div[3]/div/div/div[4]/div[2]/p',
+        'first_boot': 'div[1]/div[3]/div/div/div[5]/div[2]/p',
+        'updated_at': 'div[1]/div[3]/div/div/div[6]/div[2]/p',
+        'country': 'div[1]/div[3]/div/div/div[7]/div[2]/p',
+        'city': 'div[1]/div[3]/div/div/div[8]/div[2]/p',
+        'serial_number': 'div[1]/div[3]/div/div/div[9]/div[2]/p',
+        'pricing_policy': 'div[1]/div[3]/div/div/div[10]/div[2]/p',
+        'uptime': 'div[1]/div[3]/div/div/div[11]/div[2]/p',
+        'cru': 'div[2]/div[3]/div/div[1]/div[2]/div/div',
+        'mru': 'div[2]/div[3]/div/div[2]/div[2]/div/div',
+        'sru': 'div[2]/div[3]/div/div[3]/div[2]/div/div',
+        'hru': 'div[2]/div[3]/div/div[4]/div[2]/div/div',
+    }
+
+
+    # Confirmations of the writes changing the grid proxy data
+    writes = ('Public config saved successfully.', 'Public config removed successfully.', 'Additional fee is set successfully.')
 
     def __init__(self, browser):
         self.browser = browser
@@ -62,7 +91,7 @@ class NodePage:
         self.browser.find_element(*self.search_node_input).send_keys(node)
     
     def get_node_count(self):
-        return len(self.browser.find_elements(*self.node_table))
+        return len(self.browser.find_elements(*self.node_table, settled=True))
     
     def get_node_id(self, node_list):
         ids = []
@@ -94,40 +123,28 @@ class NodePage:
             status.append(node['status']) 
         return status
 
+    def read_column(self, index):
+        return DataTable(self.browser, self.table_xpath).column(index)
+
     def sort_node_id(self):
         self.browser.find_element(*self.node_id).click()
-        node_id = []
-        for i in range(1, len(self.browser.find_elements(*self.node_table))+1):
-            node_id.append(int(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[2]").text))
-        return node_id
+        return [int(cell) for cell in self.read_column(1)]
 
     def sort_farm_id(self):
         self.browser.find_element(*self.farm_id).click()
-        farm_id = []
-        for i in range(1, len(self.browser.find_elements(*self.node_table))+1):
-            farm_id.append(int(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[3]").text))
-        return farm_id
+        return [int(cell) for cell in self.read_column(2)]
 
     def sort_country(self):
         self.browser.find_element(*self.country).click()
-        country = []
-        for i in range(1, len(self.browser.find_elements(*self.node_table))+1):
-            country.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[4]").text)
-        return country
+        return self.read_column(3)
 
     def sort_serial_number(self):
         self.browser.find_element(*self.serial_number).click()
-        serial_number = []
-        for i in range(1, len(self.browser.find_elements(*self.node_table))+1):
-            serial_number.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[5]").text)
-        return serial_number
+        return self.read_column(4)
 
     def sort_status(self):
         self.browser.find_element(*self.status).click()
-        status = []
-        for i in range(1, len(self.browser.find_elements(*self.node_table))+1):
-            status.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[6]").text)
-        return status
+        return self.read_column(5)
     
     def node_details(self):
         self.browser.find_element(*self.node_id).click()
@@ -135,35 +152,40 @@ class NodePage:
         for i in range(1, len(self.browser.find_elements(*self.node_table))+1):
             self.browser.execute_script("window.scrollTo(0,document.body.scrollHeight)")
             self.browser.find_element(By.XPATH, self.table_xpath+ '['+ str(i) +']/td[7]/button').click()
-            details = []
             WebDriverWait(self.browser, 30).until(EC.element_to_be_clickable((By.XPATH, self.table_xpath+ '['+ str(i) +']/td[6]/span[1]/i')))
             self.browser.find_element(By.XPATH, self.table_xpath+ '['+ str(i) +']/td[6]/span[1]/i').click()
             WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.id_label))
-            details.append(self.browser.find_element(*self.id_label).text[42:]) # ID
-            details.append(self.browser.find_element(*self.ipv4).get_attribute("value")) # IPV4
-            details.append(self.browser.find_element(*self.ipv4_gateway).get_attribute("value")) # IPV4 Gateway
-            details.append(self.browser.find_element(*self.ipv6).get_attribute("value")) # IPV6
-            details.append(self.browser.find_element(*self.ipv6_gateway).get_attribute("value")) # IPV6 Gateway
-            details.append(self.browser.find_element(*self.domain).get_attribute("value")) # Domain
+            config = read_fields(self.browser, {name: locator[1] for name, locator in self.config_fields.items()})
             self.browser.find_element(*self.cancel).click()
             self.browser.execute_script("window.scrollTo(0,document.body.scrollHeight)")
             self.browser.find_element(By.XPATH, self.table_xpath+ '['+ str(i) +']/td[7]/button').click()
-            details.append(int(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[1]/div[2]/p").text)) # Node ID
-            details.append(int(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[2]/div[2]/p").text)) # Farm ID
-            details.append(int(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[3]/div[2]/p").text)) # Twin ID
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[7]/div[2]/p").text) # Country
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[8]/div[2]/p").text) # City
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[5]/div[2]/p").text) # First Boot at
-            details.append(int(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[10]/div[2]/p").text)) # Pricing Policy
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[6]/div[2]/p").text) # Updated at
-            details.append(float(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[2]/div[3]/div/div[1]/div[2]/div/div").text[:-1])) # CRU
-            details.append(float(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[2]/div[3]/div/div[3]/div[2]/div/div").text[:-1])) # SRU
-            details.append(float(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[2]/div[3]/div/div[4]/div[2]/div/div").text[:-1])) # HRU
-            details.append(float(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[2]/div[3]/div/div[2]/div[2]/div/div").text[:-1])) # MRU
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[5]/span/div").text) # Status
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[4]/div[2]/p").text) # Certification
-            details.append(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[9]/div[2]/p").text) # Serial Number
-            details.append(float(self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i+1)}]/td/div[1]/div[3]/div/div/div[11]/div[2]/p").text[:-1])) # Uptime
+            # The expanded panel is the row right below the node row
+            fields = {name: f"{self.table_xpath}[{str(i+1)}]/td/{xpath}" for name, xpath in self.detail_fields.items()}
+            fields['status'] = f"{self.table_xpath}[{str(i)}]/td[5]/span/div"
+            panel = read_fields(self.browser, fields)
+            details = []
+            details.append(config['id'][42:]) # ID
+            details.append(config['ipv4']) # IPV4
+            details.append(config['ipv4_gateway']) # IPV4 Gateway
+            details.append(config['ipv6']) # IPV6
+            details.append(config['ipv6_gateway']) # IPV6 Gateway
+            details.append(config['domain']) # Domain
+            details.append(int(panel['node_id'])) # Node ID
+            details.append(int(panel['farm_id'])) # Farm ID
+            details.append(int(panel['twin_id'])) # Twin ID
+            details.append(panel['country']) # Country
+            details.append(panel['city']) # City
+            details.append(panel['first_boot']) # First Boot at
+            details.append(int(panel['pricing_policy'])) # Pricing Policy
+            details.append(panel['updated_at']) # Updated at
+            details.append(float(panel['cru'][:-1])) # CRU
+            details.append(float(panel['sru'][:-1])) # SRU
+            details.append(float(panel['hru'][:-1])) # HRU
+            details.append(float(panel['mru'][:-1])) # MRU
+            details.append(panel['status']) # Status
+            details.append(panel['certification']) # Certification
+            details.append(panel['serial_number']) # Serial Number
+            details.append(float(panel['uptime'][:-1])) # Uptime
             nodes.append(details)
         return nodes
     
@@ -173,26 +195,10 @@ class NodePage:
                 self.browser.find_element(By.XPATH, f"{self.table_xpath}[{str(i)}]/td[6]/span[1]/i").click()
                 WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.id_label))
 
-    def add_config_input(self, ipv4, gw4, ipv6, gw6, domain):
-        if(ipv4):
-            self.browser.find_element(*self.ipv4).send_keys(Keys.CONTROL + "a")
-            self.browser.find_element(*self.ipv4).send_keys(Keys.DELETE)
-            self.browser.find_element(*self.ipv4).send_keys(ipv4)
-        if(gw4):
-            self.browser.find_element(*self.ipv4_gateway).send_keys(Keys.CONTROL + "a")
-            self.browser.find_element(*self.ipv4_gateway).send_keys(Keys.DELETE)
-            self.browser.find_element(*self.ipv4_gateway).send_keys(gw4)
-        if(ipv6):
-            self.browser.find_element(*self.ipv6).send_keys(Keys.CONTROL + "a")
-            self.browser.find_element(*self.ipv6).send_keys(Keys.DELETE)
-            self.browser.find_element(*self.ipv6).send_keys(ipv6)
-        if(gw6):
-            self.browser.find_element(*self.ipv6_gateway).send_keys(Keys.CONTROL + "a")
-            self.browser.find_element(*self.ipv6_gateway).send_keys(Keys.DELETE)
-            self.browser.find_element(*self.ipv6_gateway).send_keys(gw6)
-        if(domain):
-            self.browser.find_element(*self.domain).send_keys(Keys.CONTROL + "a")
-            self.browser.find_element(*self.domain).send_keys(domain)
+    def add_config_input(self, ipv4, gw4, ipv6, gw6, domain, keystrokes=False):
+        # Only the given fields are changed, the others keep their value
+        values = {self.ipv4: ipv4, self.ipv4_gateway: gw4, self.ipv6: ipv6, self.ipv6_gateway: gw6, self.domain: domain}
+        fill_form(self.browser, {locator: value for locator, value in values.items() if value}, keystrokes)
         return self.browser.find_element(*self.save)
 
     def get_save_button(self):
@@ -227,4 +233,11 @@ class NodePage:
 
     def wait_for(self, keyword):
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located((By.XPATH, "//*[contains(text(), '"+ keyword +"')]")))
-        return True
\ No newline at end of file
+        if keyword in self.writes:
+            # The write is confirmed, the cached grid proxy data is stale from now on
+            GridProxy.invalidate('nodes')
+        return True
+
+
+# The empty table is rendered with the search answer, which the lookups only start after
+WaitPolicy.set_timeout(NodePage.no_data, 5)
@@ -1,9 +1,10 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_policy import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import StaleElementReferenceException
+from utils.forms import fill_form
 import time
 
 class TransferPage:
@@ -40,29 +41,18 @@ class TransferPage:
         self.browser.find_element(*self.transfer_page).click()
         WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(self.transfer_tft_title))
 
-    def recipient_input(self, data):
-        self.browser.find_element(*self.twin_address_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.twin_address_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.twin_address_input).send_keys(data)
-        self.browser.find_element(*self.transfer_tft_title).click()
+    # The filled field is blurred by the form filler, which triggers its validation like clicking outside of it
+    def recipient_input(self, data, keystrokes=False):
+        fill_form(self.browser, {self.twin_address_input: data}, keystrokes)
         
-    def recipient_id_input(self, data):
-        self.browser.find_element(*self.twin_id_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.twin_id_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.twin_id_input).send_keys(data)
-        self.browser.find_element(*self.transfer_tft_title).click()
+    def recipient_id_input(self, data, keystrokes=False):
+        fill_form(self.browser, {self.twin_id_input: data}, keystrokes)
     
-    def amount_tft_input(self, data):
-        self.browser.find_element(*self.twin_address_amount_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.twin_address_amount_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.twin_address_amount_input).send_keys(data)
-        self.browser.find_element(*self.transfer_tft_title).click()
+    def amount_tft_input(self, data, keystrokes=False):
+        fill_form(self.browser, {self.twin_address_amount_input: data}, keystrokes)
         
-    def amount_tft_id_input(self, data):
-        self.browser.find_element(*self.twin_id_amount_input).send_keys(Keys.CONTROL + "a")
-        self.browser.find_element(*self.twin_id_amount_input).send_keys(Keys.DELETE)
-        self.browser.find_element(*self.twin_id_amount_input).send_keys(data)
-        self.browser.find_element(*self.transfer_tft_title).click()
+    def amount_tft_id_input(self, data, keystrokes=False):
+        fill_form(self.browser, {self.twin_id_amount_input: data}, keystrokes)
     
     def by_twin_address(self):
         self.browser.find_element(*self.by_twin_address_button).click()
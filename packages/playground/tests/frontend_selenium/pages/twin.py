@@ -2,7 +2,7 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.alert import Alert
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_policy import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 class TwinPage:
@@ -0,0 +1,64 @@
+from utils.utils import get_email, get_seed
+from utils.base import Base
+from utils.login_cache import LoginCache
+from utils.waits import wait_until_settled
+from utils.gridproxy_server import synthetic_snapshots
+from utils.load import LoadGenerator
+from pages.farm import FarmPage
+from pages.node import NodePage
+import json
+import pytest
+
+#  Only runs with '--load', each level of '--load-levels' runs for '--load-duration' seconds.
+
+
+def login(browser):
+    LoginCache(browser).login(get_seed(), get_email())
+
+
+def farms(browser):
+    login(browser)
+    FarmPage(browser).navigetor()
+    wait_until_settled(browser)
+
+
+def nodes(browser):
+    login(browser)
+    NodePage(browser).navigate()
+    wait_until_settled(browser)
+
+
+@pytest.mark.load
+def test_concurrent_sessions(browser, browser_pool, synthetic_gridproxy, request):
+    """
+      Load: concurrent sessions
+      Steps:
+          - Serve a synthetic grid of 1000 nodes and farms.
+          - Run the login, farms and nodes flows in 1, 2, 4 and 8 browsers at once.
+      Result: The flows of a single session succeed; the throughput, latencies and errors of every level are reported.
+    """
+    # The farms of the synthetic grid belong to the twin of the sessions
+    login(browser)
+    node_page = NodePage(browser)
+    node_page.navigate()
+    synthetic_gridproxy.load(synthetic_snapshots(1000, 1000, int(node_page.twin_id)))
+    overrides = dict(Base.env_overrides)
+    Base.env_overrides['GRIDPROXY_STACKS'] = [synthetic_gridproxy.url.rstrip('/')]
+    # The sessions are never drained, so they run without the performance log
+    generator = LoadGenerator({'login': login, 'farms': farms, 'nodes': nodes}, lambda: browser_pool.create_driver(performance_log=False), browser_pool.discard,
+                              request.config.getoption('load_duration'), synthetic_gridproxy)
+    try:
+        report = generator.run([int(level) for level in request.config.getoption('load_levels').split(',')])
+    finally:
+        Base.env_overrides.clear()
+        Base.env_overrides.update(overrides)
+    with open(request.config.getoption('load_report'), 'w') as file:
+        json.dump(report, file, indent=1)
+    lines = []
+    for sessions, level in sorted(report['levels'].items()):
+        lines.append(str(sessions).rjust(3) + ' sessions ' + format(level['throughput'], '.2f') + ' flows/s, errors ' + format(level['error_rate'], '.0%') +
+                     ', ' + ', '.join(name + ' p95 ' + (format(flow['p95'], '.1f') + ' s' if flow['p95'] is not None else '-') for name, flow in sorted(level['flows'].items())))
+    lines.append('degraded at ' + str(report['degraded_at']) + ' sessions' if report['degraded_at'] else 'no degradation')
+    request.node.add_report_section('call', 'load', '\n'.join(lines))
+    first = report['levels'][min(report['levels'])]
+    assert first['error_rate'] == 0, first['flows']
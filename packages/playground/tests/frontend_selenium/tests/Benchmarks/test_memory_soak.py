@@ -0,0 +1,52 @@
+from utils.utils import get_email, get_seed
+from utils.login_cache import LoginCache
+from utils.waits import wait_until_settled
+from utils.soak import sample, slope, heap_snapshot, heap_diff, heap_summary, tracked_metrics
+from pages.farm import FarmPage
+from pages.node import NodePage
+from pages.twin import TwinPage
+from pages.transfer import TransferPage
+from pages.statistics import StatisticsPage
+import json
+import pytest
+
+#  Only runs with '--soak', a cycle visits every page once and takes about 30 seconds.
+
+# Metric -> option holding the most it may grow per cycle
+limits = {'JSHeapUsedSize': 'soak_heap_slope', 'Nodes': 'soak_nodes_slope', 'JSEventListeners': 'soak_listeners_slope'}
+
+
+@pytest.mark.soak
+def test_route_memory_soak(browser, request):
+    """
+      Soak: memory across route changes
+      Steps:
+          - Login.
+          - Navigate to Nodes, Farms, Your Profile, Transfer and Statistics, repeatedly.
+          - After each cycle, collect the garbage and sample the JS heap, DOM nodes and event listeners.
+      Result: None of them grows faster than its configured slope.
+    """
+    LoginCache(browser).login(get_seed(), get_email())
+    pages = [NodePage(browser).navigate, FarmPage(browser).navigetor, TwinPage(browser).navigate, TransferPage(browser).navigate, StatisticsPage(browser).navigate]
+    cycles = request.config.getoption('soak_cycles')
+    # The first cycles fill the caches of the dashboard, the trend is taken after them
+    warmup = max(1, cycles // 10)
+    samples = []
+    snapshot = None
+    for cycle in range(cycles):
+        for navigate in pages:
+            navigate()
+            wait_until_settled(browser)
+        samples.append(sample(browser))
+        if browser.performance_log:
+            # Keep the network events and trace of the last cycle only, chromedriver holds them until read
+            browser.performance_log.clear()
+        if cycle == warmup - 1:
+            snapshot = heap_summary(json.loads(heap_snapshot(browser)))
+    trends = {metric: slope([values[metric] for values in samples[warmup:]]) for metric in tracked_metrics}
+    diff = heap_diff(snapshot, heap_summary(json.loads(heap_snapshot(browser))))
+    with open(request.config.getoption('soak_report'), 'w') as file:
+        json.dump({'samples': samples, 'trends': trends, 'heap_diff': diff}, file, indent=1)
+    request.node.add_report_section('call', 'heap growth', '\n'.join(item['object'] + ': +' + str(item['count']) + ' objects, +' + str(item['size']) + ' bytes' for item in diff))
+    leaks = [metric + ' grows by ' + format(trends[metric], '.1f') + ' per cycle' for metric, option in limits.items() if trends[metric] > request.config.getoption(option)]
+    assert leaks == []
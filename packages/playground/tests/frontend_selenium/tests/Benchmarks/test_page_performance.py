@@ -0,0 +1,55 @@
+from utils.utils import get_email, get_seed
+from utils.login_cache import LoginCache
+from pages.farm import FarmPage
+from pages.node import NodePage
+from pages.statistics import StatisticsPage
+from pages.transfer import TransferPage
+from pages.bridge import BridgePage
+import pytest
+
+#  Only runs with '--benchmark', each case loads its page '--benchmark-iterations' times.
+
+# Page -> navigation of its page object, and whether the page shows a data table
+routes = {
+    'farms': (lambda browser: FarmPage(browser).navigetor(), True),
+    'nodes': (lambda browser: NodePage(browser).navigate(), True),
+    'statistics': (lambda browser: StatisticsPage(browser).navigate(), False),
+    'transfer': (lambda browser: TransferPage(browser).navigate(), False),
+    'bridge': (lambda browser: BridgePage(browser).navigate_to_bridge(), False),
+}
+
+
+@pytest.mark.benchmark
+def test_dashboard_load(browser, benchmark):
+    """
+      Benchmark: dashboard load
+      Steps:
+          - Load the dashboard with a logged in account, repeatedly.
+      Result: Navigation timing, FCP, LCP and TBT p95 are within the baseline threshold.
+    """
+    for _ in range(benchmark.iterations):
+        # Restoring the cached login reloads the whole dashboard
+        LoginCache(browser).login(get_seed(), get_email())
+        benchmark.add('dashboard', benchmark.measure_load(browser))
+    if benchmark.save:
+        benchmark.save_baseline('dashboard')
+    assert benchmark.regressions('dashboard') == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('page', list(routes))
+def test_page_route(browser, benchmark, page):
+    """
+      Benchmark: page navigation
+      Steps:
+          - Load the dashboard with a logged in account.
+          - Navigate to the page from the side menu, repeatedly.
+      Result: Route time, TBT and time to the first table row p95 are within the baseline threshold.
+    """
+    navigate, table = routes[page]
+    for _ in range(benchmark.iterations):
+        LoginCache(browser).login(get_seed(), get_email())
+        benchmark.add(page, benchmark.measure_route(browser, lambda: navigate(browser), table))
+    if benchmark.save:
+        benchmark.save_baseline(page)
+    assert benchmark.regressions(page) == []
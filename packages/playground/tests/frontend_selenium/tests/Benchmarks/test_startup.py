@@ -0,0 +1,49 @@
+from utils.base import Base
+from pages.dashboard import DashboardPage
+import pytest
+
+#  Only runs with '--benchmark', each iteration starts from a new browser with an empty profile.
+
+
+def new_tab(browser):
+    # A tab of its own, so the performance counters only hold the next load
+    browser.switch_to.new_window('tab')
+    current = browser.current_window_handle
+    for handle in browser.window_handles:
+        if handle != current:
+            browser.switch_to.window(handle)
+            browser.close()
+    browser.switch_to.window(current)
+
+
+@pytest.mark.benchmark
+def test_startup(browser_pool, benchmark):
+    """
+      Benchmark: cold and warm startup
+      Steps:
+          - Load the dashboard in a browser with an empty profile.
+          - Load it again with a warm HTTP cache, but no storage, cache storage or service worker.
+          - Load it again with everything kept.
+      Result: Time until the profile manager is interactive, compile and script time and the JS/CSS bytes p95 are within the baseline threshold.
+    """
+    origin = Base.base_url.rstrip('/')
+    for _ in range(benchmark.iterations):
+        browser = browser_pool.create_driver()
+        try:
+            new_tab(browser)
+            browser.execute_cdp_cmd('Network.clearBrowserCache', {})
+            browser.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            benchmark.add('startup_cold', benchmark.measure_startup(browser, Base.base_url, DashboardPage.mnemonic_input))
+            new_tab(browser)
+            # Everything but the HTTP cache
+            browser.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            benchmark.add('startup_warm_cache', benchmark.measure_startup(browser, Base.base_url, DashboardPage.mnemonic_input))
+            new_tab(browser)
+            benchmark.add('startup_warm_profile', benchmark.measure_startup(browser, Base.base_url, DashboardPage.mnemonic_input))
+        finally:
+            browser_pool.discard(browser)
+    pages = ['startup_cold', 'startup_warm_cache', 'startup_warm_profile']
+    if benchmark.save:
+        for page in pages:
+            benchmark.save_baseline(page)
+    assert [regression for page in pages for regression in benchmark.regressions(page)] == []
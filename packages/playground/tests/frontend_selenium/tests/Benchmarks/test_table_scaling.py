@@ -0,0 +1,73 @@
+from utils.utils import get_email, get_seed
+from utils.login_cache import LoginCache
+from utils.gridproxy_server import synthetic_snapshots
+from pages.farm import FarmPage
+from pages.node import NodePage
+import pytest
+
+#  Only runs with '--benchmark', the dashboard queries a local Grid Proxy serving a synthetic grid of each size.
+
+# Nodes and farms of the synthetic grids
+sizes = [10, 100, 1000, 10000]
+
+
+def load_grid(browser, server, size):
+    # The farms of the synthetic grid belong to the logged in twin
+    LoginCache(browser).login(get_seed(), get_email())
+    node_page = NodePage(browser)
+    node_page.navigate()
+    server.load(synthetic_snapshots(size, size, int(node_page.twin_id)))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('size', sizes)
+def test_node_table_scaling(synthetic_browser, synthetic_gridproxy, benchmark, size):
+    """
+      Benchmark: node table scaling
+      Steps:
+          - Serve a synthetic grid of the given number of nodes and farms.
+          - Login and navigate to Your Farms, repeatedly.
+          - Click the Node ID header to sort the nodes, then search a node.
+      Result: Time to the first row, sort and search rendering p95 are within the baseline threshold.
+    """
+    browser = synthetic_browser
+    load_grid(browser, synthetic_gridproxy, size)
+    node_page = NodePage(browser)
+    for _ in range(benchmark.iterations):
+        LoginCache(browser).login(get_seed(), get_email())
+        benchmark.add('nodes@' + str(size), benchmark.measure_route(browser, node_page.navigate, True))
+        # Only the click on the header, not the table read of the page object
+        benchmark.add('nodes_sort@' + str(size), benchmark.measure_route(browser, lambda: browser.find_element(*node_page.node_id).click(), True))
+        benchmark.add('nodes_search@' + str(size), benchmark.measure_route(browser, lambda: node_page.search_nodes(str(size // 2)), True))
+    pages = ['nodes@' + str(size), 'nodes_sort@' + str(size), 'nodes_search@' + str(size)]
+    if benchmark.save:
+        for page in pages:
+            benchmark.save_baseline(page)
+    assert [regression for page in pages for regression in benchmark.regressions(page)] == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('size', sizes)
+def test_farm_table_scaling(synthetic_browser, synthetic_gridproxy, benchmark, size):
+    """
+      Benchmark: farm table scaling
+      Steps:
+          - Serve a synthetic grid of the given number of nodes and farms.
+          - Login and navigate to Your Farms, repeatedly.
+          - Show all the rows, click the Farm ID header to sort the farms, then search a farm.
+      Result: Time to the first row, all rows, sort and search rendering p95 are within the baseline threshold.
+    """
+    browser = synthetic_browser
+    load_grid(browser, synthetic_gridproxy, size)
+    farm_page = FarmPage(browser)
+    for _ in range(benchmark.iterations):
+        LoginCache(browser).login(get_seed(), get_email())
+        benchmark.add('farms@' + str(size), benchmark.measure_route(browser, farm_page.navigetor, True))
+        benchmark.add('farms_all@' + str(size), benchmark.measure_route(browser, farm_page.display_all_farms, True))
+        benchmark.add('farms_sort@' + str(size), benchmark.measure_route(browser, lambda: browser.find_element(*farm_page.farm_Id_arrow).click(), True))
+        benchmark.add('farms_search@' + str(size), benchmark.measure_route(browser, lambda: farm_page.search_functionality_invalid_name('farm_' + str(size // 2)), True))
+    pages = ['farms@' + str(size), 'farms_all@' + str(size), 'farms_sort@' + str(size), 'farms_search@' + str(size)]
+    if benchmark.save:
+        for page in pages:
+            benchmark.save_baseline(page)
+    assert [regression for page in pages for regression in benchmark.regressions(page)] == []
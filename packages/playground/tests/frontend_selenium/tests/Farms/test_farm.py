@@ -1,19 +1,15 @@
 from utils.utils import generate_gateway, generate_inavalid_gateway, generate_inavalid_ip, generate_ip, increment_ip, generate_gateway_from_ip, generate_string, get_seed, get_email, randomize_public_ipv4
 from pages.farm import FarmPage
 from utils.grid_proxy import GridProxy
-from pages.dashboard import DashboardPage
+from utils.login_cache import LoginCache
 import pytest
 
 #  Time required for the run (17 cases) is approximately 13 minutes.
 
 def before_test_setup(browser):
     farm_page = FarmPage(browser)
-    dashboard_page = DashboardPage(browser)
     farm_name = 'F_' + generate_string()
-    password = generate_string()
-    dashboard_page.open_and_load()
-    dashboard_page.import_account(get_seed())
-    dashboard_page.click_button(dashboard_page.connect_your_wallet(get_email(), password))
+    LoginCache(browser).login(get_seed(), get_email())
     farm_page.navigetor()
     return farm_page, farm_name
 
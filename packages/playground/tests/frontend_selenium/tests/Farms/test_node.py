@@ -1,23 +1,24 @@
 from utils.utils import get_email, generate_inavalid_gateway, generate_inavalid_ip, generate_ip, generate_leters, generate_string, get_node_seed, randomize_public_ipv4, valid_amount
 from pages.node import NodePage
-from utils.grid_proxy import GridProxy
-from pages.dashboard import DashboardPage
+from utils.async_grid_proxy import ConcurrentGridProxy
+from utils.login_cache import LoginCache
+from utils.wait_policy import assert_absent
+from urllib.parse import urlparse, parse_qs
 from datetime import datetime
 import random
 import math
 import time
+import pytest
 
+# The node tests use the node_seed of the leased account, which falls back to the configured one against the live network, so workers may share a node twin.
+pytestmark = pytest.mark.shared_resource('node')
 
 #  Time required for the run (12 cases) is approximately 3 minutes.
 
 def before_test_setup(browser):
     node_page = NodePage(browser)
-    grid_proxy = GridProxy(browser)
-    dashboard_page = DashboardPage(browser)
-    password = generate_string()
-    dashboard_page.open_and_load()
-    dashboard_page.import_account(get_node_seed())
-    dashboard_page.click_button(dashboard_page.connect_your_wallet(get_email(), password))
+    grid_proxy = ConcurrentGridProxy(browser)
+    LoginCache(browser).login(get_node_seed(), get_email())
     node_page.navigate()
     return node_page, grid_proxy
 
@@ -37,60 +38,83 @@ def test_node_page(browser):
         assert str(node['nodeId']) in browser.page_source
 
 
-# def test_search_node(browser):
-#     """
-#       Test Case: TC1217 - Search node
-#       Steps:
-#           - Navigate to the dashboard.
-#           - Select an account (with node).
-#           - Click on Farm from side menu.
-#           - Enter keywords on search nodes input.
-#           - Search by node ID, serial number, certification, farming policy ID
-#       Result: Nodes searched for should be listed.
-#     """
-#     node_page, _, grid_proxy, _ = before_test_setup(browser)
-#     nodes = grid_proxy.get_twin_node(str(node_page.twin_id))
-#     for node in nodes:
-#         node_page.search_nodes(str(node['nodeId']))
-#         assert node_page.get_node_count() == 1
-#         node_page.search_nodes(str(node['serialNumber']))
-#         assert node_page.get_node_count() == 1
-#         node_page.search_nodes(str(node['certificationType']))
-#         assert node_page.get_node_count() >= 1
-#         node_page.search_nodes(str(node['farmingPolicyId']))
-#         assert node_page.get_node_count() >= 1
-#     node_page.search_nodes(generate_string())
-#     assert 'No data available' in browser.page_source
+def test_node_page_requests(browser, network):
+    """
+      Test Case: TC1216 - Node list requests
+      Steps:
+          - Navigate to the dashboard.
+          - Login into an account (with node).
+          - Click on Farm from side menu.
+      Result: The page asks grid proxy for a single page of the twin nodes, at most 3 times.
+    """
+    node_page = NodePage(browser)
+    LoginCache(browser).login(get_node_seed(), get_email())
+    with network.capture() as calls:
+        node_page.navigate()
+    assert calls.count('nodes?') <= 3
+    queries = [parse_qs(urlparse(url).query) for url in calls.urls('nodes?')]
+    owned = [query for query in queries if query.get('owned_by') == [node_page.twin_id]]
+    assert owned
+    # The table shows 10 nodes per page, it never asks for more
+    assert all(query.get('size') == ['10'] for query in owned)
 
 
-# def test_sort_node(browser):
-#     """
-#       Test Case: TC1218 - Sort nodes
-#       Steps:
-#           - Navigate to the dashboard.
-#           - Select an account (with node).
-#           - Click on Farm from side menu.
-#           - Click on column header to sort it (once ascend then descend then remove the sorting).
-#           - Sort nodes in any order using Node ID, Farm ID, Country, Serial Number, Status
-#       Result: Nodes should be sorted using specified column.
-#     """
-#     node_page, _, grid_proxy, _ = before_test_setup(browser)
-#     node_list = grid_proxy.get_twin_node(str(node_page.twin_id))
-#     # Sort by Node ID
-#     assert node_page.sort_node_id() == sorted(node_page.get_node_id(node_list), reverse=False)
-#     assert node_page.sort_node_id() == sorted(node_page.get_node_id(node_list), reverse=True)
-#     # Sort by Farm ID
-#     assert node_page.sort_farm_id() == sorted(node_page.get_farm_id(node_list), reverse=False)
-#     assert node_page.sort_farm_id() == sorted(node_page.get_farm_id(node_list), reverse=True)
-#     # Sort by Country
-#     assert node_page.sort_country() == sorted(node_page.get_country(node_list), reverse=False)
-#     assert node_page.sort_country() == sorted(node_page.get_country(node_list), reverse=True)
-#     # Sort by Serial Number
-#     assert node_page.sort_serial_number() == sorted(node_page.get_serial_number(node_list), reverse=False)
-#     assert node_page.sort_serial_number() == sorted(node_page.get_serial_number(node_list), reverse=True)
-#     # Sort by Status
-#     assert node_page.sort_status() == sorted(node_page.get_status(node_list), reverse=False)
-#     assert node_page.sort_status() == sorted(node_page.get_status(node_list), reverse=True)
+def test_search_node(browser):
+    """
+      Test Case: TC1217 - Search node
+      Steps:
+          - Navigate to the dashboard.
+          - Select an account (with node).
+          - Click on Farm from side menu.
+          - Enter keywords on search nodes input.
+          - Search by node ID, serial number, certification, farming policy ID
+      Result: Nodes searched for should be listed.
+    """
+    node_page, grid_proxy = before_test_setup(browser)
+    nodes = grid_proxy.get_twin_node(str(node_page.twin_id))
+    for node in nodes:
+        node_page.search_nodes(str(node['nodeId']))
+        assert node_page.get_node_count() == 1
+        node_page.search_nodes(str(node['serialNumber']))
+        assert node_page.get_node_count() == 1
+        node_page.search_nodes(str(node['certificationType']))
+        assert node_page.get_node_count() >= 1
+        node_page.search_nodes(str(node['farmingPolicyId']))
+        assert node_page.get_node_count() >= 1
+    node_page.search_nodes(generate_string())
+    # Checked right after the search settled, instead of waiting for a row that never shows up
+    assert_absent(browser, node_page.node_rows)
+    assert browser.find_element(*node_page.no_data)
+
+
+def test_sort_node(browser):
+    """
+      Test Case: TC1218 - Sort nodes
+      Steps:
+          - Navigate to the dashboard.
+          - Select an account (with node).
+          - Click on Farm from side menu.
+          - Click on column header to sort it (once ascend then descend then remove the sorting).
+          - Sort nodes in any order using Node ID, Farm ID, Country, Serial Number, Status
+      Result: Nodes should be sorted using specified column.
+    """
+    node_page, grid_proxy = before_test_setup(browser)
+    node_list = grid_proxy.get_twin_node(str(node_page.twin_id))
+    # Sort by Node ID
+    assert node_page.sort_node_id() == sorted(node_page.get_node_id(node_list), reverse=False)
+    assert node_page.sort_node_id() == sorted(node_page.get_node_id(node_list), reverse=True)
+    # Sort by Farm ID
+    assert node_page.sort_farm_id() == sorted(node_page.get_farm_id(node_list), reverse=False)
+    assert node_page.sort_farm_id() == sorted(node_page.get_farm_id(node_list), reverse=True)
+    # Sort by Country
+    assert node_page.sort_country() == sorted(node_page.get_country(node_list), reverse=False)
+    assert node_page.sort_country() == sorted(node_page.get_country(node_list), reverse=True)
+    # Sort by Serial Number
+    assert node_page.sort_serial_number() == sorted(node_page.get_serial_number(node_list), reverse=False)
+    assert node_page.sort_serial_number() == sorted(node_page.get_serial_number(node_list), reverse=True)
+    # Sort by Status
+    assert node_page.sort_status() == sorted(node_page.get_status(node_list), reverse=False)
+    assert node_page.sort_status() == sorted(node_page.get_status(node_list), reverse=True)
 
 
 def test_node_details(browser):
@@ -149,37 +173,37 @@ def test_config_validation(browser):
     cases = [generate_string(), '1.0.0.0/66', '239.255.255/17', '239.15.35.78.5/25', '239.15.35.78.5', ' ', '*.#.@.!|+-']
     assert node_page.add_config_input( "1.1.1.1/16", '1.1.1.2', '::2/16', '::1', 'tf.grid').is_enabled() == True
     for case in cases:
-        node_page.add_config_input(case, 0, 0, 0, 0)
+        node_page.add_config_input(case, 0, 0, 0, 0, keystrokes=True)
         assert node_page.wait_for('IPv4 is not valid.')
         assert node_page.get_save_button().is_enabled()==False
-    node_page.add_config_input( '255.0.0.1/32', 0, 0, 0, 0)
+    node_page.add_config_input( '255.0.0.1/32', 0, 0, 0, 0, keystrokes=True)
     assert node_page.wait_for('Private IP addresses are not allowed.')
     assert node_page.get_save_button().is_enabled()==False
     assert node_page.add_config_input( "1.1.1.1/16", '1.1.1.2', '::2/16', '::1', 'tf.grid').is_enabled() == True
     cases = [generate_inavalid_gateway(), '1.0.0.',  '1:1:1:1', '522.255.255.255', '.239.35.78', '1.1.1.1/16', '239.15.35.78.5', ' ', '*.#.@.!|+-']
     for case in cases:
-        node_page.add_config_input( 0, case, 0, 0, 0)
+        node_page.add_config_input( 0, case, 0, 0, 0, keystrokes=True)
         assert node_page.wait_for('Gateway is not valid.')
         assert node_page.get_save_button().is_enabled()==False
     assert node_page.add_config_input( "1.1.1.1/16", '1.1.1.2', '::2/16', '::1', 'tf.grid').is_enabled() == True
     cases = [' ', '::g', '::+', ':: /6  5', '1:2:3', ':a', '1:2:3:4:5:6:7:8:9', generate_string(), generate_leters()]
     for case in cases:
-        node_page.add_config_input( 0, 0, case, 0, 0)
+        node_page.add_config_input( 0, 0, case, 0, 0, keystrokes=True)
         assert node_page.wait_for('IP is not valid.')
         assert node_page.get_save_button().is_enabled()==False
-    node_page.add_config_input( 0, 0, 'fd12:3456:789a:1::/64', 0, 0)
+    node_page.add_config_input( 0, 0, 'fd12:3456:789a:1::/64', 0, 0, keystrokes=True)
     assert node_page.wait_for('Private IP addresses are not allowed.')
     assert node_page.get_save_button().is_enabled()==False
     assert node_page.add_config_input( "1.1.1.1/16", '1.1.1.2', '::2/16', '::1', 'tf.grid').is_enabled() == True
     cases = [' ', '::g', '1:2:3', ':a', '1:2:3:4:5:6:7:8:9', generate_string(), generate_leters()]
     for case in cases:
-        node_page.add_config_input( 0, 0, 0, case, 0)
+        node_page.add_config_input( 0, 0, 0, case, 0, keystrokes=True)
         assert node_page.wait_for('Gateway is not valid.')
         assert node_page.get_save_button().is_enabled()==False
     assert node_page.add_config_input( "1.1.1.1/16", '1.1.1.2', '::2/16', '::1', 'tf.grid').is_enabled() == True
     cases = [generate_inavalid_ip(), generate_inavalid_gateway(), generate_string(), generate_leters(), '     ', '.', '/', 'q', '1', 'ww', 'ww/ww', '22.22']
     for case in cases:
-        node_page.add_config_input( 0, 0, 0, 0, case)
+        node_page.add_config_input( 0, 0, 0, 0, case, keystrokes=True)
         assert node_page.wait_for('Please provide a valid domain.')
         assert node_page.get_save_button().is_enabled()==False
 
@@ -205,7 +229,7 @@ def test_add_config(browser):
     node_page.wait_for('Public config saved successfully.')
     counter = 0
     while(old_ipv4 != new_ipv4):
-        old_ipv4 = grid_proxy.get_node_ipv4(node_id)
+        old_ipv4 = grid_proxy.get_node_ipv4(node_id, fresh=True)
         counter += 1
         if(counter==30):
             time.sleep(2)
@@ -230,9 +254,9 @@ def test_remove_config(browser):
     node_page.remove_config()
     node_page.wait_for('Public config removed successfully.')
     counter = 0
-    ipv4 = grid_proxy.get_node_ipv4(node_id)
+    ipv4 = grid_proxy.get_node_ipv4(node_id, fresh=True)
     while(ipv4 != ''):
-        ipv4 = grid_proxy.get_node_ipv4(node_id)
+        ipv4 = grid_proxy.get_node_ipv4(node_id, fresh=True)
         counter += 1
         if(counter==30):
             time.sleep(2)
@@ -264,13 +288,13 @@ def test_additional_fee(browser):
         node_page.set_fee(case)
         assert node_page.wait_for('Fee must be a valid number.')
         assert node_page.get_fee_button().is_enabled()==False
-    fee = grid_proxy.get_node_fee(node_id)
+    fee = grid_proxy.get_node_fee(node_id, fresh=True)
     new_fee = valid_amount()
     node_page.set_fee(new_fee).click()
     node_page.wait_for('Additional fee is set successfully.')
     counter = 0
     while(fee != new_fee):
-        fee = grid_proxy.get_node_fee(node_id)
+        fee = grid_proxy.get_node_fee(node_id, fresh=True)
         counter += 1
         if(counter==30):
             time.sleep(2)
@@ -1,6 +1,7 @@
 from utils.utils import generate_leters, generate_string, get_email, get_seed, get_stellar_address
-from pages.dashboard import DashboardPage
+from utils.login_cache import LoginCache
 from utils.grid_proxy import GridProxy
+from utils.base import Base
 from pages.bridge import BridgePage
 import pytest
 
@@ -9,11 +10,7 @@ import pytest
 
 def before_test_setup(browser):
     bridge_page = BridgePage(browser)
-    dashboard_page = DashboardPage(browser)
-    password = generate_string()
-    dashboard_page.open_and_load()
-    dashboard_page.import_account(get_seed())
-    dashboard_page.click_button(dashboard_page.connect_your_wallet(get_email(), password))
+    LoginCache(browser).login(get_seed(), get_email())
     bridge_page.navigate_to_bridge()
     return bridge_page
 
@@ -30,19 +27,19 @@ def test_navigate_bridge(browser):
     assert 'Transfer TFT Across Chains' in browser.page_source
 
 
-# def test_transfer_chain(browser):
-#     """
-#       Test Case: TC1113 transfer chain
-#       Steps:
-#           - Navigate to the dashboard.
-#           - Login.
-#           - Click on bridge from side menu.
-#           - Click on chain list.
-#       Result: Steller should be selected.
-#     """
-#     bridge_page = before_test_setup(browser)
-#     bridge_page.transfer_chain()
-#     assert 'stellar' in browser.page_source
+def test_transfer_chain(browser):
+    """
+      Test Case: TC1113 transfer chain
+      Steps:
+          - Navigate to the dashboard.
+          - Login.
+          - Click on bridge from side menu.
+          - Click on chain list.
+      Result: Steller should be selected.
+    """
+    bridge_page = before_test_setup(browser)
+    bridge_page.transfer_chain()
+    assert 'stellar' in browser.page_source
 
 
 def test_choose_deposit(browser):
@@ -94,7 +91,7 @@ def test_how_it_done(browser):
     assert bridge_page.deposite_learn_more() in 'https://www.manual.grid.tf/documentation/threefold_token/tft_bridges/tft_bridges.html'
 
 
-def test_check_deposit(browser):
+def test_check_deposit(browser, bridge):
     """
       Test Case: TC1117 check deposit
       Steps:
@@ -103,8 +100,9 @@ def test_check_deposit(browser):
           - Click on bridge from side menu.
           - Click on chain list.
           - Click on deposit button.
+          - Pay the bridge address with the memo text.
           - Click on close button.
-      Result: Assert that Destination and memo text will come from drid proxy.
+      Result: Assert that Destination and memo text will come from drid proxy, and the bridge received the deposit.
     """
     bridge_page = before_test_setup(browser)
     grid_proxy = GridProxy(browser)
@@ -112,6 +110,13 @@ def test_check_deposit(browser):
     assert bridge_page.wait_for(amount_text)
     assert bridge_address == 'GDHJP6TF3UXYXTNEZ2P36J5FH7W4BJJQ4AYYAXC66I2Q2AH5B6O6BCFG'
     assert bridge_page.wait_for('Add twin ID as memo text or you will lose your tokens')
+    if bridge:
+        # Deposit like a user would, to the destination and with the memo the dialog shows
+        stellar_balance = bridge.balance(get_stellar_address())
+        bridge.deposit(get_stellar_address(), twin_id[twin_id.find('_')+1:], 2.1)
+        payment = bridge.payments_of(get_stellar_address())[-1]
+        assert (payment['to'], payment['memo']) == (bridge_address, twin_id)
+        assert bridge.balance(get_stellar_address()) == round(stellar_balance - 2.1, 7)
     user_address = bridge_page.twin_address()
     assert grid_proxy.get_twin_address(twin_id[twin_id.find('_')+1:]) == user_address
 
@@ -206,8 +211,9 @@ def test_check_withdraw_invalid_tft_amount(browser):
     assert bridge_page.check_withdraw_invalid_tft_amount('') == False
     assert bridge_page.wait_for('This field is required')
 
-@pytest.mark.skip(reason="https://github.com/threefoldtech/tfgrid-sdk-ts/issues/3752")
-def test_check_withdraw(browser):
+@pytest.mark.skipif(not (Base.horizon_standin and Base.tfchain_command), reason="https://github.com/threefoldtech/tfgrid-sdk-ts/issues/3752, only runs against the local chain and bridge")
+@pytest.mark.shared_resource('balance')
+def test_check_withdraw(browser, bridge, tfchain):
     """
       Test Case: TC1132 check withdraw 
       Steps:
@@ -225,6 +231,9 @@ def test_check_withdraw(browser):
     balance = bridge_page.get_balance()
     min_balance = float(balance)-2
     max_balance = float(balance)-2.11
+    stellar_balance = bridge.balance(get_stellar_address())
     bridge_page.check_withdraw(get_stellar_address(), '2.1').click()
     assert bridge_page.wait_for('Transaction Succeeded')
     assert format(float(max_balance), '.3f') <= format(float(bridge_page.get_balance_withdraw(balance)), '.3f') <= format(float(min_balance), '.3f')
+    # The local bridge saw the withdrawal submitted to the local chain and pays it out on Stellar, minus its fee
+    assert bridge.wait_for_balance(get_stellar_address(), round(stellar_balance + 1.1, 7))
@@ -118,6 +118,7 @@ def test_create_account(browser):
     assert dashboard_page.wait_for_button(dashboard_page.login_account(password)).is_enabled() == True
 
 
+@pytest.mark.shared_resource('email')
 def test_account_validation(browser):
     """
       Test Cases: TC1777 - Connect your wallet Validation
@@ -141,11 +142,11 @@ def test_account_validation(browser):
     dashboard_page.import_account(get_seed())
     cases = [generate_string(), '123456', '!)$%&@#(+?', '1@c@vva.ca', '1f@test,com', '@test.com', 'test@.com', 'test@com']
     for case in cases:
-        assert dashboard_page.connect_your_wallet(case, '123456').get_attribute("disabled") == 'true'
+        assert dashboard_page.connect_your_wallet(case, '123456', keystrokes=True).get_attribute("disabled") == 'true'
         assert dashboard_page.wait_for('Please provide a valid email address')
-    assert dashboard_page.connect_your_wallet('', '123456').get_attribute("disabled") == 'true'
+    assert dashboard_page.connect_your_wallet('', '123456', keystrokes=True).get_attribute("disabled") == 'true'
     assert dashboard_page.wait_for('Email is required')
-    assert dashboard_page.connect_your_wallet(get_email(), '12345').get_attribute("disabled") == 'true'
+    assert dashboard_page.connect_your_wallet(get_email(), '12345', keystrokes=True).get_attribute("disabled") == 'true'
     assert dashboard_page.wait_for('Password must be at least 6 characters')
     dashboard_page.connect_your_wallet(get_email(), '123456')
     dashboard_page.confirm_password('12345')
@@ -1,16 +1,13 @@
 from utils.utils import generate_leters, generate_string, get_email, get_seed, valid_amount, invalid_address, invalid_amount, invalid_amount_negtive
 from pages.transfer import TransferPage
-from pages.dashboard import DashboardPage
+from utils.login_cache import LoginCache
+import pytest
 
 #  Time required for the run (10 cases) is approximately 2 minutes.
 
 def before_test_setup(browser):
     transfer_page = TransferPage(browser)
-    dashboard_page = DashboardPage(browser)
-    password = generate_string()
-    dashboard_page.open_and_load()
-    dashboard_page.import_account(get_seed())
-    dashboard_page.click_button(dashboard_page.connect_your_wallet(get_email(), password))
+    LoginCache(browser).login(get_seed(), get_email())
     transfer_page.navigate()
     return transfer_page
 
@@ -63,7 +60,7 @@ def test_invalid_address(browser):
     assert transfer_page.get_address_submit().is_enabled() == False
     cases = [' ', generate_string(), invalid_address(), generate_leters()]
     for case in cases:
-      transfer_page.recipient_input(case)
+      transfer_page.recipient_input(case, keystrokes=True)
       assert transfer_page.wait_for('Invalid Address')
       assert transfer_page.get_address_submit().is_enabled() == False
 
@@ -85,17 +82,17 @@ def test_twin_id(browser):
     transfer_page.recipient_id_input(twin_id)
     assert transfer_page.wait_for('Cannot transfer to yourself')
     assert transfer_page.get_id_submit().is_enabled() == False
-    transfer_page.recipient_id_input(999999999)
+    transfer_page.recipient_id_input(999999999, keystrokes=True)
     assert transfer_page.wait_for('This twin id doesn')
     assert transfer_page.get_id_submit().is_enabled() == False
     cases = [' ', generate_string(), invalid_address(), generate_leters()]
     for case in cases:
-      transfer_page.recipient_id_input(case)
+      transfer_page.recipient_id_input(case, keystrokes=True)
       assert transfer_page.wait_for('Twin ID should be a valid integer')
       assert transfer_page.get_id_submit().is_enabled() == False
     cases = ['0', '-52']
     for case in cases:
-      transfer_page.recipient_id_input(case)
+      transfer_page.recipient_id_input(case, keystrokes=True)
       assert transfer_page.wait_for('Twin ID should be greater than zero')
       assert transfer_page.get_id_submit().is_enabled() == False
 
@@ -134,22 +131,23 @@ def test_invalid_amount(browser):
     balance = transfer_page.get_balance()
     cases = ['-900.009', invalid_amount_negtive()]
     for case in cases:
-      transfer_page.amount_tft_input(case)
+      transfer_page.amount_tft_input(case, keystrokes=True)
       assert transfer_page.wait_for('Amount must be greater than 0')
       assert transfer_page.get_address_submit().is_enabled() == False
     cases = ['0', ' ']
     for case in cases:
-      transfer_page.amount_tft_input(case)
+      transfer_page.amount_tft_input(case, keystrokes=True)
       assert transfer_page.wait_for('Transfer amount is required')
       assert transfer_page.get_address_submit().is_enabled() == False
-    transfer_page.amount_tft_input(invalid_amount())
+    transfer_page.amount_tft_input(invalid_amount(), keystrokes=True)
     assert transfer_page.wait_for('Amount can have 3 decimals only.')
     assert transfer_page.get_address_submit().is_enabled() == False
-    transfer_page.amount_tft_input(format(float(balance)+100,'.3f'))
+    transfer_page.amount_tft_input(format(float(balance)+100,'.3f'), keystrokes=True)
     assert transfer_page.wait_for('Insufficient funds')
     assert transfer_page.get_address_submit().is_enabled() == False
 
 
+@pytest.mark.shared_resource('balance')
 def test_transfer_tfts_on_tfchain_by_twin_address(browser):
     """
     Test Case: TC988 - Transfer TFTs on the TFChain
@@ -174,6 +172,7 @@ def test_transfer_tfts_on_tfchain_by_twin_address(browser):
     assert format(float(max_balance),'.3f') <= format(float(transfer_page.get_balance_transfer(balance)),'.3f') <= format(float(min_balance),'.3f')
 
 
+@pytest.mark.shared_resource('balance')
 def test_transfer_tfts_on_tfchain_by_twin_id(browser):
     """
     Test Case: TC1917 - Transfer TFTs on the TFChain by ID
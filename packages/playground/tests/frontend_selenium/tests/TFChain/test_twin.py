@@ -1,7 +1,7 @@
 from utils.utils import get_email, generate_email, generate_string, get_seed
 from pages.twin import TwinPage
 from utils.grid_proxy import GridProxy
-from pages.dashboard import DashboardPage
+from utils.login_cache import LoginCache
 import pytest
 
 #  Time required for the run (6 cases) is approximately 3 minutes.
@@ -9,15 +9,12 @@ import pytest
 
 def before_test_setup(browser):
     twin_page = TwinPage(browser)
-    dashboard_page = DashboardPage(browser)
-    password = generate_string()
-    dashboard_page.open_and_load()
-    dashboard_page.import_account(get_seed())
-    dashboard_page.click_button(dashboard_page.connect_your_wallet(get_email(), password))
+    LoginCache(browser).login(get_seed(), get_email())
     twin_page.navigate()
     return twin_page
 
 
+@pytest.mark.shared_resource('email')
 def test_twin_details(browser):
     """
       Test Cases: TC1867 - Twin details
@@ -34,6 +31,7 @@ def test_twin_details(browser):
     assert twin_email == get_email()
 
 
+@pytest.mark.shared_resource('email')
 def test_edit_twin_email(browser):
     """
       Test Cases: TC925- edit twin email
@@ -59,6 +57,8 @@ def test_edit_twin_email(browser):
     assert twin_page.wait_for('Email is required')
     twin_page.edit_twin_email(email)
     twin_page.press_submit_btn()
+    # The cached login skips connecting the wallet, which is what restores the account email
+    LoginCache.invalidate(get_seed())
     assert twin_page.wait_for(email)
 
 
@@ -0,0 +1,26 @@
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.base import Base
+
+
+def test_env_overrides_on_reused_browser(browser_pool):
+    """
+      Stand-ins: reused browser
+      Steps:
+          - Borrow a browser from the pool and give it back, which resets it.
+          - Borrow it again and load the dashboard.
+      Result: The dashboard config still points to the configured stand-ins.
+    """
+    if not Base.env_overrides:
+        pytest.skip('No stand-in configured')
+    driver = browser_pool.acquire()
+    browser_pool.release(driver)
+    reused = browser_pool.acquire()
+    try:
+        assert reused is driver
+        reused.get(Base.base_url)
+        env = WebDriverWait(reused, 30).until(lambda browser: browser.execute_script("return window.env;"))
+        for key, value in Base.env_overrides.items():
+            assert env[key] == value, key
+    finally:
+        browser_pool.release(reused)
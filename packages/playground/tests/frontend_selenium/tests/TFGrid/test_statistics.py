@@ -2,7 +2,7 @@ import math
 import pytest
 from utils.utils import byte_converter,convert_to_scaled_float
 from pages.statistics import StatisticsPage
-from utils.grid_proxy import GridProxy
+from utils.async_grid_proxy import ConcurrentGridProxy
 from pages.dashboard import DashboardPage
 
 def before_test_setup(browser):
@@ -23,7 +23,7 @@ def test_statistics_details(browser):
       Result: Assert that the displayed values should match the data from the grid proxy.
     """
     statistics_page = before_test_setup(browser)
-    grid_proxy = GridProxy(browser)
+    grid_proxy = ConcurrentGridProxy(browser)
     statistics_details = statistics_page.statistics_detials()
     grid_statistics_details = grid_proxy.get_stats()
     # Convert necessary values from string to integer for comparison, but keeping the dictionary structure
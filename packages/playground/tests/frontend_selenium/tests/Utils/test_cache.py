@@ -0,0 +1,68 @@
+from utils.cache import ResponseCache
+import time
+
+#  Pure logic, runs without a browser in well under a second.
+
+
+def test_cache_ttl():
+    """
+      Test Case: Cache expiry
+      Steps:
+          - Cache a response with a short time to live.
+          - Read it before and after it expired.
+      Result: The response is a hit, then a miss.
+    """
+    cache = ResponseCache(ttl=0.05)
+    cache.put('nodes/1', {'nodeId': 1})
+    assert cache.get('nodes/1') == {'nodeId': 1}
+    time.sleep(0.1)
+    assert cache.get('nodes/1') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_lru_eviction():
+    """
+      Test Case: Cache eviction
+      Steps:
+          - Fill a cache of two entries, then read the oldest one.
+          - Cache a third response.
+      Result: The least recently used entry is evicted, the two others are kept.
+    """
+    cache = ResponseCache(size=2)
+    cache.put('nodes/1', 1)
+    cache.put('nodes/2', 2)
+    cache.get('nodes/1')
+    cache.put('nodes/3', 3)
+    assert cache.get('nodes/2') is None
+    assert (cache.get('nodes/1'), cache.get('nodes/3')) == (1, 3)
+
+
+def test_cache_invalidate_prefix():
+    """
+      Test Case: Cache invalidation
+      Steps:
+          - Cache node and farm responses.
+          - Invalidate the farms.
+      Result: Only the farm responses are dropped.
+    """
+    cache = ResponseCache()
+    cache.put('nodes/1', 1)
+    cache.put('farms?farm_id=1', 1)
+    cache.invalidate('farms')
+    assert cache.get('farms?farm_id=1') is None
+    assert cache.get('nodes/1') == 1
+
+
+def test_cache_copies():
+    """
+      Test Case: Cached responses are not shared
+      Steps:
+          - Cache a response, then change both the cached object and a hit.
+      Result: The next hit still holds the response as it was received.
+    """
+    cache = ResponseCache()
+    data = {'publicIps': [{'ip': '1.1.1.1/16'}]}
+    cache.put('farms?farm_id=1', data)
+    data['publicIps'].clear()
+    cache.get('farms?farm_id=1')['publicIps'].append({'ip': '2.2.2.2/16'})
+    assert cache.get('farms?farm_id=1') == {'publicIps': [{'ip': '1.1.1.1/16'}]}
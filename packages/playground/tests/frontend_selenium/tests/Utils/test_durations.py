@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from utils.durations import DurationHistory, DurationScheduling
+import json
+
+#  Pure logic, runs without a browser in well under a second.
+
+
+class Worker:
+
+    # Stands for an xdist worker, keeping the test indexes it is asked to run
+    def __init__(self):
+        self.sent = []
+
+    def send_runtest_some(self, indexes):
+        self.sent.append(indexes)
+
+
+def history(tmp_path, durations):
+    path = tmp_path / 'durations.json'
+    path.write_text(json.dumps(durations))
+    return DurationHistory(str(path))
+
+
+def test_longest_work_units_first(tmp_path, pytestconfig, monkeypatch):
+    """
+      Test Case: Duration scheduling order
+      Steps:
+          - Record the durations of three tests in three work units.
+          - Assign the units to a worker one by one.
+      Result: The units go out slowest first.
+    """
+    tests = ['tests/a.py::test_a', 'tests/b.py::test_b', 'tests/c.py::test_c']
+    # The scheduler is made for a run on two workers
+    monkeypatch.setattr(pytestconfig.option, 'tx', ['2*popen'])
+    scheduler = DurationScheduling(pytestconfig, None, history(tmp_path, {tests[0]: 5, tests[1]: 50, tests[2]: 20}))
+    worker = Worker()
+    scheduler.registered_collections[worker] = tests
+    scheduler.workqueue = OrderedDict((test.split('::')[0], {test: False}) for test in tests)
+    for _ in tests:
+        scheduler._assign_work_unit(worker)
+    assert worker.sent == [[1], [2], [0]]
+
+
+def test_unknown_test_estimate(tmp_path):
+    """
+      Test Case: Duration of a test that never ran
+      Steps:
+          - Record the durations of two tests of a module and one of another.
+          - Estimate new tests of the first module, of a new module, and with no history at all.
+      Result: The module average, then the suite average, then the default duration are used.
+    """
+    durations = history(tmp_path, {'tests/a.py::test_one': 10, 'tests/a.py::test_two': 20, 'tests/b.py::test_one': 60})
+    assert durations.estimate('tests/a.py::test_one@node') == 10
+    assert durations.estimate('tests/a.py::test_three') == 15
+    assert durations.estimate('tests/c.py::test_one') == 30
+    assert DurationHistory(str(tmp_path / 'missing.json')).estimate('tests/a.py::test_one') == DurationHistory.default_duration
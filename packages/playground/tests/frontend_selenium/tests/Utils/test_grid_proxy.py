@@ -0,0 +1,38 @@
+from utils.grid_proxy import iter_json_array
+import json
+
+#  Pure logic, runs without a browser in well under a second.
+
+
+class Response:
+
+    # Stands for a streamed requests response, handing out the body in chunks of the asked size
+    def __init__(self, body):
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+def test_json_array_across_chunks():
+    """
+      Test Case: Streamed JSON array
+      Steps:
+          - Stream a JSON array of nested objects and non ASCII text in chunks of every size.
+      Result: The items match the whole body parsed at once, whichever byte the chunks are split at.
+    """
+    items = [{'nodeId': i, 'location': {'city': 'Zürich ☃'}, 'tags': ['a, b', ']'], 'rented': i % 2 == 0} for i in range(5)]
+    body = json.dumps(items, ensure_ascii=False, indent=1).encode()
+    for chunk_size in range(1, len(body) + 1):
+        assert list(iter_json_array(Response(body), chunk_size)) == json.loads(body)
+
+
+def test_json_array_empty():
+    """
+      Test Case: Empty streamed JSON array
+      Steps:
+          - Stream an empty array one byte at a time.
+      Result: No item is yielded.
+    """
+    assert list(iter_json_array(Response(b'[ ]'), 1)) == []
@@ -0,0 +1,77 @@
+from utils.gridproxy_server import GridProxyServer, synthetic_snapshots
+import requests
+import pytest
+
+#  Runs the Grid Proxy stand-in on a local port, without a browser.
+
+
+@pytest.fixture(scope='module')
+def grid_proxy():
+    snapshots = synthetic_snapshots(nodes=30, farms=3, twin_id=100)
+    for node in snapshots['nodes'][:5]:
+        node['rentContractId'], node['rentedByTwinId'] = node['nodeId'], 200
+    server = GridProxyServer()
+    server.load(snapshots)
+    server.start()
+    yield server
+    server.stop()
+
+
+def get(grid_proxy, path, **params):
+    return requests.get(grid_proxy.url + path, params=params, timeout=5)
+
+
+def test_filter(grid_proxy):
+    """
+      Test Case: Stand-in filters
+      Steps:
+          - List the nodes of two farms, the rented nodes and the nodes available for the renter.
+      Result: Only the matching nodes are listed.
+    """
+    nodes = get(grid_proxy, 'nodes', farm_ids='1,3', size=100).json()
+    assert nodes and {node['farmId'] for node in nodes} == {1, 3}
+    rented = {node['nodeId'] for node in get(grid_proxy, 'nodes', rented='true', size=100).json()}
+    assert rented == {1, 2, 3, 4, 5}
+    rentable = {node['nodeId'] for node in get(grid_proxy, 'nodes', rented='false', size=100).json()}
+    assert not rented & rentable and len(rented | rentable) == 30
+    available = {node['nodeId'] for node in get(grid_proxy, 'nodes', available_for=200, size=100).json()}
+    assert available == rented | rentable
+
+
+def test_sort(grid_proxy):
+    """
+      Test Case: Stand-in sorting
+      Steps:
+          - List the nodes sorted by total CRU, in descending order.
+      Result: The nodes are listed from the most CRU to the least.
+    """
+    nodes = get(grid_proxy, 'nodes', sort_by='total_cru', sort_order='desc', size=100).json()
+    cru = [node['total_resources']['cru'] for node in nodes]
+    assert len(cru) == 30 and cru == sorted(cru, reverse=True)
+
+
+def test_pagination(grid_proxy):
+    """
+      Test Case: Stand-in pagination
+      Steps:
+          - List the nodes page by page with their count.
+      Result: The pages hold the nodes in order without overlap, the count header has the total.
+    """
+    response = get(grid_proxy, 'nodes', page=1, size=12, ret_count='true')
+    assert response.headers['count'] == '30'
+    pages = [response.json()] + [get(grid_proxy, 'nodes', page=page, size=12).json() for page in (2, 3, 4)]
+    assert [len(page) for page in pages] == [12, 12, 6, 0]
+    assert [node['nodeId'] for page in pages for node in page] == list(range(1, 31))
+
+
+@pytest.mark.parametrize('params', [{'unknown_filter': 'x'}, {'page': 'abc'}, {'page': 0}, {'size': -1}])
+def test_bad_request(grid_proxy, params):
+    """
+      Test Case: Stand-in bad requests
+      Steps:
+          - List the nodes with an unknown filter, or an invalid page or size.
+      Result: The stand-in answers with a 400 and the reason.
+    """
+    response = get(grid_proxy, 'nodes', **params)
+    assert response.status_code == 400
+    assert response.json()['error'].startswith(('unknown filter', 'invalid'))
@@ -1,34 +1,359 @@
 import pytest
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
-from pyvirtualdisplay import Display
+from utils.base import Base
+from utils.browser_pool import BrowserPool, env_script
+from utils.lease import AccountLease
+from utils.durations import DurationHistory, DurationScheduling
+from utils.gridproxy_server import GridProxyServer
+from utils.cassette import Cassette
+from utils.tfchain_node import TFChainNode
+from utils.horizon_server import HorizonServer
+from utils.utils import get_stellar_address
+from utils.benchmark import PageBenchmark
+from utils.profiler import CommandProfiler
+from utils.interactions import InteractionProfiler, instrument_interactions
+from utils.tracing import Tracer, instrument, instrument_pages, trace_events
+from utils.network_log import PerformanceLog, NetworkMonitor, network_requests, save_har
+from utils.grid_proxy import GridProxy
+from utils.async_grid_proxy import ConcurrentGridProxy
+import json
 
 """
 This module contains shared browser fixtures.
 """
 
+def pytest_addoption(parser):
+    parser.addoption('--durations-file', default='.test_durations.json', help="File keeping the recorded duration of every test, used to balance '--dist loadgroup' runs.")
+    parser.addoption('--record-mode', default='off', choices=('off', 'record', 'replay'), help="Record the remote HTTP traffic of the tests and the browsers into cassettes, or answer it from them.")
+    parser.addoption('--cassettes', default='cassettes', help="Directory of the recorded cassettes, one per test.")
+    parser.addoption('--profile-commands', default='', help="Write the WebDriver commands of every test, page object method and locator, ranked by time, to this JSON file.")
+    parser.addoption('--command-budgets', default='', help="JSON file of the most WebDriver commands a test may issue, by test name or node id.")
+    parser.addoption('--profile-interactions', action='store_true', help="Report the INP and long tasks of every table sort and search with the test result.")
+    parser.addoption('--inp-budget', type=float, default=0, help="Fail the tests with a profiled sort or search slower than this many milliseconds to the next paint.")
+    parser.addoption('--blocking-budget', type=float, default=0, help="Fail the tests with a profiled sort or search blocking the main thread longer than this many milliseconds.")
+    parser.addoption('--trace-dir', default='', help="Directory receiving a Chrome trace (Perfetto) of every test, with its page object steps, Grid Proxy queries, WebDriver commands, sleeps and the browser trace.")
+    parser.addoption('--har-dir', default='', help="Directory receiving a HAR of the requests of every test, with an audit of duplicate, failed, blocked and chained requests.")
+    parser.addoption('--soak', action='store_true', help="Run the memory soak tests, which are skipped otherwise.")
+    parser.addoption('--soak-cycles', type=int, default=200, help="Times the soak tests go through all the pages.")
+    parser.addoption('--soak-heap-slope', type=float, default=50000, help="Most JS heap bytes the dashboard may keep per soak cycle.")
+    parser.addoption('--soak-nodes-slope', type=float, default=10, help="Most DOM nodes the dashboard may keep per soak cycle.")
+    parser.addoption('--soak-listeners-slope', type=float, default=5, help="Most event listeners the dashboard may keep per soak cycle.")
+    parser.addoption('--soak-report', default='soak_report.json', help="File receiving the soak samples, trends and heap snapshot diff.")
+    parser.addoption('--load', action='store_true', help="Run the concurrent load tests, which are skipped otherwise.")
+    parser.addoption('--load-levels', default='1,2,4,8', help="Comma separated numbers of concurrent browser sessions the load tests ramp through.")
+    parser.addoption('--load-duration', type=float, default=60, help="Seconds the load tests run at each level.")
+    parser.addoption('--load-report', default='load_report.json', help="File receiving the throughput, latencies and errors of every load level.")
+    parser.addoption('--benchmark', action='store_true', help="Run the page performance benchmarks, which are skipped otherwise.")
+    parser.addoption('--benchmark-iterations', type=int, default=10, help="Times each benchmark loads its page.")
+    parser.addoption('--benchmark-baseline', default='benchmark_baseline.json', help="File keeping the p50/p95 of every page, the benchmarks fail when slower.")
+    parser.addoption('--benchmark-threshold', type=float, default=0.2, help="Allowed p95 slowdown against the baseline, 0.2 being 20%%.")
+    parser.addoption('--benchmark-save', action='store_true', help="Store the measured p50/p95 as the new baseline.")
+    parser.addoption('--benchmark-history', default='benchmark_history.jsonl', help="File the p50/p95 of every benchmark run are appended to.")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "shared_resource(name): tests using the same resource never run at the same time on parallel workers.")
+    config.addinivalue_line("markers", "xdist_group(name): run all the tests of the group on the same worker.")
+    config.addinivalue_line("markers", "command_budget(commands): fail the test when it issues more WebDriver commands.")
+    if config.getoption('profile_commands') or config.getoption('command_budgets'):
+        # Plain runs do not time nor attribute their WebDriver commands
+        CommandProfiler.current = CommandProfiler()
+    BrowserPool.performance_log = bool(config.getoption('har_dir') or config.getoption('trace_dir'))
+    BrowserPool.perf_observer = bool(config.getoption('benchmark') or config.getoption('profile_interactions'))
+    if config.getoption('trace_dir'):
+        Tracer.current = Tracer(config.getoption('trace_dir'))
+        instrument_pages()
+        instrument(GridProxy, 'gridproxy')
+        instrument(ConcurrentGridProxy, 'gridproxy')
+    config.addinivalue_line("markers", "interaction_budget(inp, blocking): fail the test when a profiled sort or search is slower, in milliseconds.")
+    if config.getoption('profile_interactions'):
+        InteractionProfiler.current = InteractionProfiler()
+        instrument_interactions()
+    config.command_budgets = {}
+    if config.getoption('command_budgets'):
+        with open(config.getoption('command_budgets')) as file:
+            config.command_budgets = json.load(file)
+    config.addinivalue_line("markers", "benchmark: page performance benchmark, only run with '--benchmark'.")
+    config.addinivalue_line("markers", "soak: memory soak test, only run with '--soak'.")
+    config.addinivalue_line("markers", "load: concurrent load test, only run with '--load'.")
+    if config.getoption('benchmark'):
+        PageBenchmark.current = PageBenchmark(config.getoption('benchmark_iterations'), config.getoption('benchmark_baseline'),
+                                              config.getoption('benchmark_threshold'), config.getoption('benchmark_save'))
+    DurationHistory.current = DurationHistory(config.getoption('durations_file'))
+    Cassette.current = Cassette(config.getoption('cassettes'), config.getoption('record_mode'))
+    # The xdist controller only schedules tests, every worker (or a serial run) leases its own account
+    if config.getoption('numprocesses', None) and not hasattr(config, 'workerinput'):
+        return
+    accounts = AccountLease.load_accounts()
+    if accounts:
+        try:
+            AccountLease(accounts).acquire()
+        except RuntimeError as e:
+            raise pytest.UsageError(str(e))
+
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    # Start the longest groups first instead of the biggest ones
+    if config.getvalue('dist') == 'loadgroup':
+        return DurationScheduling(config, log, DurationHistory.current)
+
+
+def pytest_runtest_logreport(report):
+    # Reports of the workers also reach the controller, which records the whole run
+    if DurationHistory.current:
+        DurationHistory.current.add(report)
+
+
+def pytest_sessionfinish(session):
+    if DurationHistory.current and not hasattr(session.config, 'workerinput'):
+        DurationHistory.current.save()
+    # Every worker appends the pages it measured
+    if PageBenchmark.current and PageBenchmark.current.results and session.config.getoption('benchmark_history'):
+        PageBenchmark.current.save_history(session.config.getoption('benchmark_history'))
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    try:
+        result = yield
+    finally:
+        if InteractionProfiler.current and InteractionProfiler.current.actions(item.nodeid):
+            item.add_report_section('call', 'interactions', InteractionProfiler.current.summary(item.nodeid))
+    if CommandProfiler.current:
+        # Commands of the setup count as well, most tests log in and navigate there
+        marker = item.get_closest_marker('command_budget')
+        budget = marker.args[0] if marker else item.config.command_budgets.get(item.nodeid, item.config.command_budgets.get(item.name))
+        commands = CommandProfiler.current.count(item.nodeid)
+        if budget is not None and commands > budget:
+            raise AssertionError(item.name + " issued " + str(commands) + " WebDriver commands, over its budget of " + str(budget))
+    if InteractionProfiler.current:
+        marker = item.get_closest_marker('interaction_budget')
+        limits = marker.kwargs if marker else {}
+        failures = InteractionProfiler.current.over_budget(item.nodeid, limits.get('inp', item.config.getoption('inp_budget')),
+                                                           limits.get('blocking', item.config.getoption('blocking_budget')))
+        if failures:
+            raise AssertionError(item.name + " froze the page: " + ', '.join(failures))
+    return result
+
+
+def pytest_terminal_summary(terminalreporter):
+    profile = terminalreporter.config.getoption('profile_commands')
+    if profile and CommandProfiler.current and CommandProfiler.current.tests:
+        if hasattr(terminalreporter.config, 'workerinput'):
+            profile += '.' + terminalreporter.config.workerinput['workerid']
+        CommandProfiler.current.save(profile)
+        terminalreporter.section('WebDriver commands')
+        for name, (count, seconds) in CommandProfiler.current.ranked('by_method'):
+            terminalreporter.write_line(name.ljust(50) + str(count).rjust(7) + ' commands ' + format(seconds, '.1f').rjust(7) + ' s')
+    if PageBenchmark.current is None or not PageBenchmark.current.results:
+        return
+    terminalreporter.section('page benchmarks (ms, bytes)')
+    for page in sorted(PageBenchmark.current.results):
+        for metric, stats in sorted(PageBenchmark.current.summary(page).items()):
+            terminalreporter.write_line(page.ljust(16) + metric.ljust(20) + 'p50 ' + format(stats['p50'], '.0f').rjust(7) + '  p95 ' + format(stats['p95'], '.0f').rjust(7))
+    tables = sorted(set(page.split('@')[0] for page in PageBenchmark.current.results if '@' in page))
+    if tables:
+        terminalreporter.section('table scaling, p95 (ms) by rows')
+        for table in tables:
+            for metric, curve in sorted(PageBenchmark.current.scaling(table).items()):
+                terminalreporter.write_line(table.ljust(16) + metric.ljust(20) + '  '.join(str(size) + ': ' + format(p95, '.0f') for size, p95 in curve))
+
+
+def pytest_unconfigure(config):
+    if Cassette.current:
+        Cassette.current.save()
+    if AccountLease.current:
+        AccountLease.current.release()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # Map shared resources to xdist groups, so '--dist loadgroup' keeps them on a single worker
+    for item in items:
+        if item.get_closest_marker('benchmark') and PageBenchmark.current is None:
+            item.add_marker(pytest.mark.skip(reason="Benchmarks only run with '--benchmark'"))
+        if item.get_closest_marker('soak') and not config.getoption('soak'):
+            item.add_marker(pytest.mark.skip(reason="Soak tests only run with '--soak'"))
+        if item.get_closest_marker('load') and not config.getoption('load'):
+            item.add_marker(pytest.mark.skip(reason="Load tests only run with '--load'"))
+        marker = item.get_closest_marker('shared_resource')
+        if marker:
+            item.add_marker(pytest.mark.xdist_group(marker.args[0]))
+        if item.get_closest_marker('command_budget') and CommandProfiler.current is None:
+            CommandProfiler.current = CommandProfiler()
+        if 'network' in item.fixturenames:
+            # The network fixture reads the requests from the performance log
+            BrowserPool.performance_log = True
+
+
+@pytest.fixture
+def network(browser):
+    # Requests of a block of the test, e.g. 'with network.capture() as calls:'
+    return NetworkMonitor(browser.performance_log)
+
+
 @pytest.fixture
-def browser():
+def benchmark():
+    return PageBenchmark.current
+
+
+@pytest.fixture(autouse=True)
+def cassette(request):
+
+    # Each test records into, and replays from, its own cassette
+    Cassette.current.use(request.node.nodeid)
+
+    yield Cassette.current
+
+    Cassette.current.save()
+
+
+@pytest.fixture(scope='session')
+def gridproxy():
+
+    # Serve the Grid Proxy from local snapshots to both the dashboard and the Python client, if configured
+    if not Base.gridproxy_snapshots:
+        yield None
+        return
+    server = GridProxyServer(Base.gridproxy_snapshots)
+    server.start()
+    live_url = Base.gridproxy_url
+    Base.gridproxy_url = server.url
+    Base.env_overrides['GRIDPROXY_STACKS'] = [server.url.rstrip('/')]
+
+    yield server
+
+    Base.gridproxy_url = live_url
+    Base.env_overrides.pop('GRIDPROXY_STACKS', None)
+    server.stop()
+
+
+@pytest.fixture(scope='session')
+def synthetic_gridproxy():
 
-    # Virtual display for the browser, allowing it to run in headless mode
-    display = Display(visible=0, size=(1920, 1080))
-    display.start()
+    # Grid Proxy stand-in the scaling benchmarks load their synthetic grids into
+    server = GridProxyServer()
+    server.start()
 
-    # Initialize the ChromeDriver instance with options
-    options = webdriver.ChromeOptions()
-    #options.add_extension('extension.crx')  # For Adding Extension
-    driver = webdriver.Chrome(options=options)
-    # driver = webdriver.Chrome(options=options, service=ChromeService(ChromeDriverManager().install()))
-    driver.set_window_size(1920, 1080)
+    yield server
+
+    server.stop()
+
+
+@pytest.fixture
+def synthetic_browser(browser, synthetic_gridproxy):
+
+    # The browser queries the synthetic grid from the next page load on, the other overrides are kept
+    overrides = dict(Base.env_overrides, GRIDPROXY_STACKS=[synthetic_gridproxy.url.rstrip('/')])
+    script = browser.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': env_script % json.dumps(overrides)})
+
+    yield browser
+
+    browser.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': script['identifier']})
+
+
+@pytest.fixture(scope='session')
+def tfchain():
+
+    # Run the tests against a local TFChain dev node sealing every extrinsic right away, if configured
+    if not Base.tfchain_command:
+        yield None
+        return
+    node = TFChainNode(Base.tfchain_command)
+    node.start()
+    Base.env_overrides['SUBSTRATE_STACKS'] = [node.url]
+
+    yield node
+
+    Base.env_overrides.pop('SUBSTRATE_STACKS', None)
+    node.stop()
+
+
+@pytest.fixture(scope='session')
+def funded_accounts(tfchain):
+
+    # Accounts endowed by the local TFChain genesis, each worker leases one of them as its own account
+    if tfchain is None:
+        pytest.skip('No local TFChain configured')
+    return tfchain.accounts
+
+
+@pytest.fixture(scope='session')
+def horizon(tfchain):
+
+    # Answer the Stellar lookups of the bridge from a local Horizon, where the test Stellar address holds 100 TFT
+    if not Base.horizon_standin:
+        yield None
+        return
+    server = HorizonServer()
+    server.fund(get_stellar_address(), 100)
+    server.start()
+    Base.env_overrides.update(server.env)
+    if tfchain is not None:
+        # The withdrawals submitted to the local chain are paid out like the bridge does
+        tfchain.listeners.append(server.withdrawn)
+
+    yield server
+
+    if tfchain is not None:
+        tfchain.listeners.remove(server.withdrawn)
+    for key in server.env:
+        Base.env_overrides.pop(key, None)
+    server.stop()
+
+
+@pytest.fixture
+def bridge(horizon):
+
+    # Each test gets the default latencies back
+    if horizon is not None:
+        horizon.latency = 0
+        horizon.confirmation_latency = 0
+    return horizon
+
+
+@pytest.fixture(scope='session')
+def browser_pool(gridproxy, tfchain, horizon):
+
+    # Long-lived browsers shared by all the tests of the session
+    pool = BrowserPool(Base.pool_size, Base.max_uses, Base.max_heap_mb)
+    pool.start()
+
+    yield pool
+
+    # Quit the remaining browsers and end the virtual display
+    pool.stop()
+
+
+@pytest.fixture
+def browser(browser_pool, request):
 
-    # Make its calls wait up to 60 seconds for elements to appear
-    driver.implicitly_wait(60)
+    # Borrow a clean WebDriver instance from the pool for the setup
+    driver = browser_pool.acquire()
+    driver.profiler = CommandProfiler.current
+    if CommandProfiler.current:
+        CommandProfiler.current.begin(request.node.nodeid)
+    if InteractionProfiler.current:
+        InteractionProfiler.current.begin(request.node.nodeid)
+    driver.performance_log = None
+    if BrowserPool.performance_log:
+        # Drop the network events and trace of the previous tests
+        driver.performance_log = PerformanceLog(driver)
+        driver.performance_log.clear()
+    if Tracer.current:
+        driver.tracer = Tracer.current
+        Tracer.current.begin(request.node.nodeid)
 
-    # Return the WebDriver instance for the setup
     yield driver
 
-    # Quit the WebDriver instance for the cleanup
-    driver.quit()
-    # Ending virtual display for the browser
-    display.stop()
\ No newline at end of file
+    # Reset the browser state and give it back to the pool for the cleanup
+    if CommandProfiler.current:
+        CommandProfiler.current.end()
+    if InteractionProfiler.current:
+        InteractionProfiler.current.end()
+    messages = driver.performance_log.read() if driver.performance_log else []
+    if Tracer.current:
+        Tracer.current.end(trace_events(messages))
+    if request.config.getoption('har_dir'):
+        save_har(request.config.getoption('har_dir'), request.node.nodeid, network_requests(messages))
+    browser_pool.release(driver)
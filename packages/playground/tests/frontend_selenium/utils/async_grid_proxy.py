@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from utils.base import Base
+from utils.grid_proxy import GridProxy
+import asyncio
+
+"""
+This module contains the asyncio Grid Proxy client and its sync facade for the tests.
+"""
+
+class AsyncGridProxy:
+
+    """
+    Same getters as GridProxy as coroutines, running at most `concurrency` queries at a time.
+    """
+
+    def __init__(self, browser, concurrency=8):
+        self.grid_proxy = GridProxy(browser)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # The queries run on the pooled GridProxy session, which keeps enough connections for every worker
+        self.executor = ThreadPoolExecutor(max_workers=min(concurrency, GridProxy.pool_size))
+
+    async def call(self, function, *args, **kwargs):
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    def __getattr__(self, name):
+        function = getattr(self.grid_proxy, name)
+        if not callable(function):
+            return function
+
+        async def method(*args, **kwargs):
+            return await self.call(function, *args, **kwargs)
+        return method
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    async def get_stats(self):
+        up, standby = await asyncio.gather(
+            self.call(lambda: self.grid_proxy.request('GET', Base.gridproxy_url + 'stats?status=up').json()),
+            self.call(lambda: self.grid_proxy.request('GET', Base.gridproxy_url + 'stats?status=standby').json()))
+        return GridProxy.merge_stats(up, standby)
+
+    async def map(self, name, arguments):
+        return await asyncio.gather(*[getattr(self, name)(argument) for argument in arguments])
+
+
+class ConcurrentGridProxy(GridProxy):
+
+    """
+    Sync facade over AsyncGridProxy, letting the tests run independent queries concurrently without being async.
+    """
+
+    def __init__(self, browser, concurrency=8):
+        super().__init__(browser)
+        self.concurrency = concurrency
+
+    def run(self, name, *args):
+        async def main():
+            # A new client per event loop, as asyncio primitives belong to the loop they are used in
+            client = AsyncGridProxy(self.browser, self.concurrency)
+            try:
+                return await getattr(client, name)(*args)
+            finally:
+                client.close()
+        return asyncio.run(main())
+
+    def get_stats(self):
+        return self.run('get_stats')
+
+    def map(self, name, arguments):
+        # e.g. map('get_node', node_ids) returns the records of all the nodes, fetched concurrently
+        return self.run('map', name, arguments)
@@ -9,4 +9,16 @@ class Base:
     if str(net) == 'main':
         gridproxy_url = 'https://gridproxy.grid.tf/'
     else:
-        gridproxy_url = 'https://gridproxy.' + str(net) + '.grid.tf/'
\ No newline at end of file
+        gridproxy_url = 'https://gridproxy.' + str(net) + '.grid.tf/'
+    pool_size = config.getint('Browser', 'pool_size', fallback=1)
+    max_uses = config.getint('Browser', 'max_uses', fallback=50)
+    max_heap_mb = config.getint('Browser', 'max_heap_mb', fallback=512)
+    element_timeout = config.getint('Browser', 'element_timeout', fallback=60)
+    # Snapshot directory of the local Grid Proxy stand-in, the live Grid Proxy is used when empty
+    gridproxy_snapshots = config.get('StandIns', 'gridproxy', fallback='')
+    # Command starting a local TFChain dev node, the live TFChain is used when empty
+    tfchain_command = config.get('StandIns', 'tfchain', fallback='')
+    # Serve Horizon and the TFT bridge from a local stand-in instead of the Stellar network
+    horizon_standin = config.getboolean('StandIns', 'horizon', fallback=False)
+    # Values replacing the ones of the dashboard config.js (window.env) in every browser
+    env_overrides = {}
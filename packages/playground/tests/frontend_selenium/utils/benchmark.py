@@ -0,0 +1,199 @@
+from utils.wait_policy import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from utils.waits import wait_until_settled
+import datetime
+import fcntl
+import json
+import math
+import os
+
+"""
+This module contains the page performance benchmark: the browser side collectors, the percentiles and the baseline check.
+"""
+
+# Records paints, long tasks, slow events and the first table row of every document, the browser pool installs it on every new document
+perf_observer = """
+    (() => {
+        if (window.__perf) return;
+        const perf = window.__perf = {lcp: 0, longTasks: [], events: [], routeStart: 0, actionStart: 0, firstRow: null, lastRow: null};
+        const observe = (type, callback, options) => {
+            try {
+                new PerformanceObserver(list => list.getEntries().forEach(callback)).observe(Object.assign({type, buffered: true}, options));
+            } catch (e) {}
+        };
+        observe('largest-contentful-paint', entry => { perf.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+        observe('longtask', entry => {
+            perf.longTasks.push([entry.startTime, entry.duration]);
+            // Bounded, so the collector does not grow the heap of long sessions
+            if (perf.longTasks.length > 1000) perf.longTasks.shift();
+        });
+        // Event timing of the interactions, from the input to the next paint
+        observe('event', entry => {
+            if (!entry.interactionId) return;
+            perf.events.push([entry.startTime, entry.duration, entry.name]);
+            if (perf.events.length > 1000) perf.events.shift();
+        }, {durationThreshold: 16});
+        // Loading and empty rows are not data
+        const row = '.v-data-table tbody tr:not(.v-data-table-rows-loading):not(.v-data-table-rows-no-data)';
+        new MutationObserver(records => {
+            if (perf.firstRow === null && document.querySelector(row)) perf.firstRow = performance.now();
+            // Last change of the table rows, when a sort or a search is fully rendered
+            const inTable = record => {
+                const node = record.target.nodeType === Node.ELEMENT_NODE ? record.target : record.target.parentElement;
+                return node && node.closest('.v-data-table tbody');
+            };
+            if (records.some(inTable)) perf.lastRow = performance.now();
+        }).observe(document, {childList: true, subtree: true, characterData: true});
+        // Route measurements start from the mark instead of the navigation start
+        perf.mark = () => { perf.routeStart = performance.now(); perf.firstRow = null; perf.lastRow = null; };
+    })();
+"""
+
+# Both scripts install the observer themselves if the tab misses it, its observers are buffered
+load_script = perf_observer + """
+    const perf = window.__perf;
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const paint = performance.getEntriesByName('first-contentful-paint')[0];
+    const fcp = paint ? paint.startTime : 0;
+    return {
+        ttfb: navigation.responseStart,
+        dom_content_loaded: navigation.domContentLoadedEventEnd,
+        load: navigation.loadEventEnd,
+        fcp: fcp,
+        lcp: perf.lcp,
+        // Blocking time is the part of each long task above 50 ms, counted from the first paint
+        tbt: perf.longTasks.filter(([start]) => start >= fcp).reduce((total, [, duration]) => total + Math.max(0, duration - 50), 0),
+    };
+"""
+
+route_script = perf_observer + """
+    const perf = window.__perf;
+    const now = performance.now();
+    return {
+        route: now - perf.routeStart,
+        tbt: perf.longTasks.filter(([start]) => start >= perf.routeStart).reduce((total, [, duration]) => total + Math.max(0, duration - 50), 0),
+        first_row: perf.firstRow === null ? null : perf.firstRow - perf.routeStart,
+        rows_rendered: perf.lastRow === null ? null : perf.lastRow - perf.routeStart,
+    };
+"""
+
+# Bytes of the bundle, as transferred (0 when served by a cache) and once decoded, along with the time since the navigation started
+startup_script = """
+    const resources = performance.getEntriesByType('resource');
+    const sum = (extension, key) => resources.filter(resource => new URL(resource.name).pathname.endsWith(extension))
+        .reduce((total, resource) => total + resource[key], 0);
+    return {
+        interactive: performance.now(),
+        js_bytes: sum('.js', 'transferSize'),
+        css_bytes: sum('.css', 'transferSize'),
+        js_decoded_bytes: sum('.js', 'decodedBodySize'),
+        css_decoded_bytes: sum('.css', 'decodedBodySize'),
+    };
+"""
+
+
+def percentile(values, p):
+    # Nearest rank, so the reported value is always one of the measured ones
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class PageBenchmark:
+
+    # Benchmark of the run, set from the '--benchmark' options
+    current = None
+    # Regressions smaller than this many milliseconds are noise
+    min_regression = 50
+
+    def __init__(self, iterations=10, baseline='benchmark_baseline.json', threshold=0.2, save=False):
+        self.iterations = iterations
+        self.baseline_path = baseline
+        self.threshold = threshold
+        self.save = save
+        # Page -> metric -> measured milliseconds
+        self.results = {}
+
+    def measure_load(self, browser):
+        # Metrics of the last full page load, once it is settled
+        wait_until_settled(browser)
+        return browser.execute_script(load_script)
+
+    def measure_route(self, browser, navigate, table=False):
+        # Metrics of an in-app navigation done by a page object, until the first data row or the settled page
+        browser.execute_script(perf_observer + "window.__perf.mark();")
+        navigate()
+        if table:
+            WebDriverWait(browser, 60, poll_frequency=0.05).until(lambda driver: driver.execute_script("return window.__perf.firstRow !== null;"))
+        wait_until_settled(browser)
+        metrics = browser.execute_script(route_script)
+        if not table:
+            for metric in ('first_row', 'rows_rendered'):
+                metrics.pop(metric)
+        return metrics
+
+    def measure_startup(self, browser, url, ready):
+        # Metrics of loading the dashboard in the current tab, until the ready element is interactive
+        browser.execute_cdp_cmd('Performance.enable', {})
+        browser.get(url)
+        WebDriverWait(browser, 60, poll_frequency=0.05).until(EC.element_to_be_clickable(ready))
+        metrics = browser.execute_script(startup_script)
+        # Main thread time spent compiling and running the scripts of the tab
+        counters = {metric['name']: metric['value'] for metric in browser.execute_cdp_cmd('Performance.getMetrics', {})['metrics']}
+        metrics['compile'] = counters.get('V8CompileDuration', 0) * 1000
+        metrics['script'] = counters.get('ScriptDuration', 0) * 1000
+        # Let the service worker and the caches finish before the next load
+        wait_until_settled(browser)
+        return metrics
+
+    def add(self, page, metrics):
+        for metric, value in metrics.items():
+            if value is not None:
+                self.results.setdefault(page, {}).setdefault(metric, []).append(value)
+
+    def summary(self, page):
+        return {metric: {'p50': percentile(values, 50), 'p95': percentile(values, 95)} for metric, values in self.results.get(page, {}).items()}
+
+    def baseline(self):
+        if not os.path.exists(self.baseline_path):
+            return {}
+        with open(self.baseline_path) as file:
+            return json.load(file)
+
+    def regressions(self, page):
+        # Metrics whose p95 got slower than the baseline by more than the threshold
+        baseline = self.baseline().get(page, {})
+        regressions = []
+        for metric, stats in self.summary(page).items():
+            if metric not in baseline:
+                continue
+            allowed = max(baseline[metric]['p95'] * (1 + self.threshold), baseline[metric]['p95'] + self.min_regression)
+            if stats['p95'] > allowed:
+                unit = ' bytes' if metric.endswith('bytes') else ' ms'
+                regressions.append(page + ' ' + metric + ' p95 ' + format(stats['p95'], '.0f') + unit + ' > ' + format(allowed, '.0f') + unit)
+        return regressions
+
+    def scaling(self, name):
+        # Metric -> [size, p95] of the pages measured as '<name>@<size>', the smallest size first
+        curve = {}
+        sizes = sorted(int(page.split('@')[1]) for page in self.results if page.startswith(name + '@'))
+        for size in sizes:
+            for metric, stats in self.summary(name + '@' + str(size)).items():
+                curve.setdefault(metric, []).append([size, stats['p95']])
+        return curve
+
+    def save_history(self, path):
+        # One line per run, so the results can be followed over time
+        with open(path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(path, 'a') as file:
+                file.write(json.dumps({'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                                       'pages': {page: self.summary(page) for page in sorted(self.results)}}) + '\n')
+
+    def save_baseline(self, page):
+        # Parallel workers update their own pages of the same file
+        with open(self.baseline_path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            baseline = self.baseline()
+            baseline[page] = self.summary(page)
+            with open(self.baseline_path, 'w') as file:
+                json.dump(baseline, file, indent=2, sort_keys=True)
@@ -0,0 +1,146 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.chrome.service import Service as ChromeService
+from pyvirtualdisplay import Display
+import json
+from utils.base import Base
+from utils.waits import network_tracker
+from utils.wait_policy import PolicyChrome
+from utils.cassette import Cassette, BrowserCassette
+from utils.benchmark import perf_observer
+from utils.tracing import Tracer, trace_categories
+
+"""
+This module contains a pool of long-lived browsers shared between tests.
+"""
+
+# Applies the overrides as soon as config.js assigns window.env
+env_script = """
+    (() => {
+        const overrides = %s;
+        let env;
+        Object.defineProperty(window, 'env', {
+            configurable: true,
+            get: () => env,
+            set: value => { env = Object.assign(value, overrides); },
+        });
+    })();
+"""
+
+class BrowserPool:
+
+    # Whether chromedriver keeps the network events and trace in the performance log, only read for the HARs, traces and network fixture
+    performance_log = False
+    # Whether every document collects paints, long tasks and table rows, only read by the benchmarks and interaction profiles
+    perf_observer = False
+
+    def __init__(self, size=1, max_uses=50, max_heap_mb=512):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap = max_heap_mb * 1024 * 1024
+        self.display = None
+        self.idle = []
+        self.uses = {}
+        self.cassettes = {}
+
+    def start(self):
+        # Virtual display for the browsers, allowing them to run in headless mode
+        self.display = Display(visible=0, size=(1920, 1080))
+        self.display.start()
+
+    def stop(self):
+        while self.idle:
+            self.discard(self.idle.pop())
+        if self.display:
+            self.display.stop()
+
+    def create_driver(self, performance_log=None):
+        # Initialize the ChromeDriver instance with options
+        options = webdriver.ChromeOptions()
+        #options.add_extension('extension.crx')  # For Adding Extension
+        if self.performance_log if performance_log is None else performance_log:
+            # chromedriver logs the network events, and the browser trace when tracing, in the performance log
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            if Tracer.current:
+                options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False, 'traceCategories': trace_categories})
+            else:
+                options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        driver = PolicyChrome(options=options)
+        # driver = PolicyChrome(options=options, service=ChromeService(ChromeDriverManager().install()))
+        driver.set_window_size(1920, 1080)
+        # Lookups wait explicitly per locator, so looking for an absent element returns right away
+        driver.implicitly_wait(0)
+        self.install_scripts(driver)
+        if Cassette.current and Cassette.current.mode != 'off':
+            self.cassettes[driver.session_id] = BrowserCassette(driver, Cassette.current)
+            self.cassettes[driver.session_id].start()
+        self.uses[driver.session_id] = 0
+        return driver
+
+    def install_scripts(self, driver):
+        # The scripts only run in the tab they were added to, every new tab needs them again
+        # Track the requests in flight of every page, for the readiness waits
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': network_tracker})
+        if self.perf_observer:
+            # Collect paints, long tasks and table rows for the benchmarks
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': perf_observer})
+        if Base.env_overrides:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': env_script % json.dumps(Base.env_overrides)})
+
+    def acquire(self):
+        while self.idle:
+            driver = self.idle.pop()
+            if self.is_healthy(driver):
+                self.uses[driver.session_id] += 1
+                return driver
+            self.discard(driver)
+        driver = self.create_driver()
+        self.uses[driver.session_id] += 1
+        return driver
+
+    def release(self, driver):
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            self.discard(driver)
+            return
+        if len(self.idle) < self.size and self.is_healthy(driver):
+            self.idle.append(driver)
+        else:
+            self.discard(driver)
+
+    def reset(self, driver):
+        # Open a fresh tab and close every other window, which also drops sessionStorage
+        driver.switch_to.new_window('tab')
+        current = driver.current_window_handle
+        for handle in driver.window_handles:
+            if handle != current:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(current)
+        self.install_scripts(driver)
+        # Clear cookies, localStorage, IndexedDB and service workers left by the previous test
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': Base.base_url.rstrip('/'), 'storageTypes': 'all'})
+        driver.get(Base.base_url)
+
+    def is_healthy(self, driver):
+        if self.uses.get(driver.session_id, self.max_uses) >= self.max_uses:
+            return False
+        try:
+            heap = driver.execute_script("return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0;")
+        except WebDriverException:
+            # The browser or chromedriver crashed
+            return False
+        return heap < self.max_heap
+
+    def discard(self, driver):
+        self.uses.pop(driver.session_id, None)
+        cassette = self.cassettes.pop(driver.session_id, None)
+        if cassette:
+            cassette.stop()
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
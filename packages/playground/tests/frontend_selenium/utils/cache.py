@@ -0,0 +1,44 @@
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+"""
+This module contains the response cache of the Grid Proxy client.
+"""
+
+class ResponseCache:
+
+    def __init__(self, ttl=30, size=256):
+        self.ttl = ttl
+        self.size = size
+        # Key -> (expiry time, value), the least recently used entries first
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            # Every caller gets its own copy, so changing a result never alters the later hits
+            return copy.deepcopy(entry[1])
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, prefix=''):
+        # Drop every entry whose key starts with the prefix, all of them by default
+        with self.lock:
+            for key in [key for key in self.entries if key.startswith(prefix)]:
+                del self.entries[key]
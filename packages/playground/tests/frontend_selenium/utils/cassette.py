@@ -0,0 +1,202 @@
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from selenium.webdriver.common.bidi import cdp
+import threading
+import base64
+import json
+import trio
+import os
+import re
+
+"""
+This module contains the record/replay cassettes of the remote HTTP traffic of the tests and of the browsers.
+"""
+
+# Bodies are stored decoded, so the headers describing the transfer no longer apply
+dropped_headers = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class Cassette:
+
+    # Cassette of the run, set from the '--record-mode' option
+    current = None
+
+    def __init__(self, directory, mode='off'):
+        self.directory = directory
+        self.mode = mode
+        self.test = 'session'
+        self.lock = threading.Lock()
+        # Responses recorded by the current test and replayed so far, by request
+        self.recorded = {}
+        self.played = {}
+        # Every recorded test -> request -> responses, in the order they were received
+        self.tests = {}
+        self.misses = []
+        if mode == 'replay' and os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith('.json'):
+                    with open(os.path.join(directory, name)) as file:
+                        self.tests[name[:-len('.json')]] = json.load(file)
+
+    @staticmethod
+    def key(method, url):
+        return method.upper() + ' ' + url
+
+    def path(self, test):
+        return os.path.join(self.directory, re.sub(r'[^\w.-]+', '_', test) + '.json')
+
+    def use(self, test):
+        # Start the cassette of a test, saving the one of the previous test
+        self.save()
+        with self.lock:
+            self.test = re.sub(r'[^\w.-]+', '_', test)
+            self.recorded = {}
+            self.played = {}
+
+    def save(self):
+        with self.lock:
+            if self.mode != 'record' or not self.recorded:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(self.test), 'w') as file:
+                json.dump(self.recorded, file, indent=1)
+            self.recorded = {}
+
+    def record(self, method, url, status, headers, body):
+        entry = {'status': status, 'headers': {name: value for name, value in headers.items() if name.lower() not in dropped_headers},
+                 'body': base64.b64encode(body).decode()}
+        with self.lock:
+            self.recorded.setdefault(self.key(method, url), []).append(entry)
+
+    def play(self, method, url):
+        key = self.key(method, url)
+        with self.lock:
+            entries = self.tests.get(self.test, {}).get(key)
+            if not entries:
+                # The response may have been cached by another test when recording, e.g. by the Grid Proxy client
+                entries = next((responses[key] for responses in self.tests.values() if key in responses), None)
+            if not entries:
+                self.misses.append(key)
+                return None
+            # Repeated requests get the next recorded response, then the last one again
+            index = self.played.get(key, 0)
+            self.played[key] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+        return dict(entry, body=base64.b64decode(entry['body']))
+
+
+class CassetteAdapter(HTTPAdapter):
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == 'replay':
+            entry = self.cassette.play(request.method, request.url)
+            if entry is None:
+                raise requests.ConnectionError('No recorded response for ' + request.method + ' ' + request.url, request=request)
+            response = requests.Response()
+            response.status_code = entry['status']
+            response.headers = CaseInsensitiveDict(entry['headers'])
+            response.encoding = get_encoding_from_headers(response.headers)
+            response._content = entry['body']
+            response._content_consumed = True
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            return response
+        response = super().send(request, **kwargs)
+        if self.cassette.mode == 'record':
+            self.cassette.record(request.method, request.url, response.status_code, response.headers, response.content)
+        return response
+
+
+class BrowserCassette:
+
+    """
+    Records or replays the remote (https) requests of every tab of a browser through CDP Fetch interception.
+    """
+
+    def __init__(self, driver, cassette):
+        self.driver = driver
+        self.cassette = cassette
+        self.thread = None
+        self.token = None
+        self.scope = None
+        self.ready = threading.Event()
+
+    def start(self):
+        address = self.driver.capabilities['goog:chromeOptions']['debuggerAddress']
+        version = requests.get('http://' + address + '/json/version').json()
+        major = version['Browser'].split('/')[1].split('.')[0]
+        self.thread = threading.Thread(target=trio.run, args=(self.intercept, version['webSocketDebuggerUrl'], major), daemon=True)
+        self.thread.start()
+        self.ready.wait(10)
+
+    def stop(self):
+        if self.token:
+            try:
+                trio.from_thread.run_sync(self.scope.cancel, trio_token=self.token)
+            except trio.RunFinishedError:
+                pass
+        if self.thread:
+            self.thread.join(5)
+
+    async def intercept(self, url, version):
+        devtools = cdp.import_devtools(version)
+        self.token = trio.lowlevel.current_trio_token()
+        with trio.CancelScope() as self.scope:
+            async with cdp.open_cdp(url) as connection:
+                async with trio.open_nursery() as nursery:
+                    attached = connection.listen(devtools.target.AttachedToTarget, buffer_size=100)
+                    # New tabs wait until their interception is enabled, so even their first request is caught
+                    await connection.execute(devtools.target.set_auto_attach(auto_attach=True, wait_for_debugger_on_start=True, flatten=True))
+                    self.ready.set()
+                    async for event in attached:
+                        session = cdp.CdpSession(connection.ws, event.session_id, event.target_info.target_id)
+                        connection.sessions[event.session_id] = session
+                        nursery.start_soon(self.handle_target, session, devtools, event.target_info.type_ == 'page')
+
+    async def handle_target(self, session, devtools, intercepted):
+        # The local dashboard and stand-ins are served over http, only the remote https traffic goes through the cassette
+        stage = devtools.fetch.RequestStage.RESPONSE if self.cassette.mode == 'record' else devtools.fetch.RequestStage.REQUEST
+        try:
+            if intercepted:
+                paused = session.listen(devtools.fetch.RequestPaused, buffer_size=1000)
+                await session.execute(devtools.fetch.enable(patterns=[devtools.fetch.RequestPattern(url_pattern='https://*', request_stage=stage)]))
+            await session.execute(devtools.runtime.run_if_waiting_for_debugger())
+            if not intercepted:
+                return
+            async for event in paused:
+                if self.cassette.mode == 'record':
+                    await self.record(session, devtools, event)
+                else:
+                    await self.replay(session, devtools, event)
+        except (cdp.BrowserError, cdp.CdpConnectionClosed, trio.BrokenResourceError):
+            # The tab was closed
+            pass
+
+    async def record(self, session, devtools, event):
+        if event.response_status_code is not None:
+            try:
+                body, encoded = await session.execute(devtools.fetch.get_response_body(event.request_id))
+                body = base64.b64decode(body) if encoded else body.encode()
+            except cdp.BrowserError:
+                # Redirects have no body
+                body = b''
+            headers = {header.name: header.value for header in event.response_headers or []}
+            self.cassette.record(event.request.method, event.request.url, event.response_status_code, headers, body)
+        await session.execute(devtools.fetch.continue_request(event.request_id))
+
+    async def replay(self, session, devtools, event):
+        entry = self.cassette.play(event.request.method, event.request.url)
+        if entry is None:
+            # Requests missing from the cassettes fail instead of reaching the network
+            await session.execute(devtools.fetch.fail_request(event.request_id, devtools.network.ErrorReason.INTERNET_DISCONNECTED))
+            return
+        headers = [devtools.fetch.HeaderEntry(name, value) for name, value in entry['headers'].items()]
+        await session.execute(devtools.fetch.fulfill_request(event.request_id, entry['status'], response_headers=headers,
+                                                             body=base64.b64encode(entry['body']).decode()))
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from xdist.scheduler import LoadGroupScheduling
+import json
+import os
+
+"""
+This module contains the recorded test durations and the duration-aware xdist scheduler.
+"""
+
+class DurationHistory:
+
+    # The history of the current run
+    current = None
+
+    # Weight of the latest run in the recorded average
+    smoothing = 0.5
+    # Duration assumed for a test that never ran before
+    default_duration = 60.0
+
+    def __init__(self, path):
+        self.path = path
+        self.durations = {}
+        self.current = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                self.durations = json.load(file)
+
+    @staticmethod
+    def test_id(nodeid):
+        # xdist appends '@group' to the ids of grouped tests
+        if nodeid.rfind('@') > nodeid.rfind(']'):
+            return nodeid.rsplit('@', 1)[0]
+        return nodeid
+
+    def add(self, report):
+        nodeid = self.test_id(report.nodeid)
+        self.current.setdefault(nodeid, [0.0, False])
+        self.current[nodeid][0] += report.duration
+        if report.when == 'call' and not report.skipped:
+            self.current[nodeid][1] = True
+
+    def save(self):
+        if not self.current:
+            return
+        for nodeid, (duration, ran) in self.current.items():
+            # Skipped tests would record the duration of a skip, not of the test
+            if not ran:
+                continue
+            if nodeid in self.durations:
+                duration = self.smoothing * duration + (1 - self.smoothing) * self.durations[nodeid]
+            self.durations[nodeid] = round(duration, 3)
+        with open(self.path, 'w') as file:
+            json.dump(self.durations, file, indent=2, sort_keys=True)
+
+    def estimate(self, nodeid):
+        nodeid = self.test_id(nodeid)
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        # Fall back to the average of the same module, then of the whole suite
+        module = nodeid.split('::')[0]
+        known = [duration for test, duration in self.durations.items() if test.split('::')[0] == module]
+        if not known:
+            known = list(self.durations.values())
+        if not known:
+            return self.default_duration
+        return sum(known) / len(known)
+
+
+class DurationScheduling(LoadGroupScheduling):
+
+    """
+    Longest-processing-time-first scheduling of the 'loadgroup' work units, using the recorded durations.
+    """
+
+    def __init__(self, config, log=None, history=None):
+        super().__init__(config, log)
+        self.history = history
+        self.ordered = False
+
+    def weight(self, work_unit):
+        return sum(self.history.estimate(nodeid) for nodeid in work_unit)
+
+    def _assign_work_unit(self, node):
+        if not self.ordered:
+            # The slowest units start first, the short ones fill the gaps at the end of the run
+            self.workqueue = OrderedDict(sorted(self.workqueue.items(), key=lambda item: -self.weight(item[1])))
+            self.ordered = True
+        super()._assign_work_unit(node)
+
+    def _reschedule(self, node):
+        if node.shutting_down:
+            return
+        if not self.workqueue:
+            node.shutdown()
+            return
+        # Only give more work to a worker on its last test, so no unit waits behind a long one on a busy worker;
+        # a worker holds its last test until it knows the next one, so it never gets down to zero pending
+        if self._pending_of(self.assigned_work[node]) > 1:
+            return
+        self._assign_work_unit(node)
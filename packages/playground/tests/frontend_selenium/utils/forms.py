@@ -0,0 +1,41 @@
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from utils.base import Base
+
+"""
+This module contains the form filler setting every field of a dialog in one script.
+"""
+
+fill_script = """
+    const fields = arguments[0];
+    const find = (by, value) => by === 'xpath'
+        ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(value);
+    const elements = fields.map(([by, value]) => find(by, value));
+    // Leave the form untouched until every field is rendered
+    const missing = fields.filter((field, i) => !elements[i]).map(([by, value]) => value);
+    if (missing.length) return missing;
+    elements.forEach((element, i) => {
+        const prototype = element.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        element.focus();
+        // The native setter bypasses the value tracking of Vue, so the events below are seen as user input
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, fields[i][2]);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        element.blur();
+    });
+    return [];
+"""
+
+
+# Sets the fields of a form from a {locator: value} dict, in one script unless keystrokes are asked for
+def fill_form(browser, values, keystrokes=False):
+    if keystrokes:
+        # Type real keys, for the tests checking the validation on each keystroke. The browser still gets
+        # one key event per character, but the clear, the value and the blur go in a single command per field
+        for locator, value in values.items():
+            browser.find_element(*locator).send_keys(Keys.CONTROL, "a", Keys.NULL, Keys.DELETE, str(value), Keys.TAB)
+        return
+    fields = [[by, xpath, str(value)] for (by, xpath), value in values.items()]
+    WebDriverWait(browser, Base.element_timeout, poll_frequency=0.1).until(
+        lambda driver: not driver.execute_script(fill_script, fields), "Form fields not found: " + str([field[1] for field in fields]))
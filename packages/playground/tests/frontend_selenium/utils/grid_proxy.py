@@ -1,79 +1,244 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from utils.base import Base
+from utils.cache import ResponseCache
+from utils.cassette import Cassette, CassetteAdapter
+from utils.records import Node, Twin, Farm
+import threading
+import codecs
+import json
+import time
 
 """
 This module contains Grid Proxy getters.
 """
 
+def iter_json_array(response, chunk_size=65536):
+    # Yield the items of a JSON array response as soon as each of them is fully received
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += text.decode(chunk)
+        position = 0
+        while True:
+            # Skip the opening bracket, the separators and the whitespace between the items
+            while position < len(buffer) and buffer[position] in '[, \t\r\n':
+                position += 1
+            if position == len(buffer) or buffer[position] == ']':
+                break
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The item is not complete yet, wait for the next chunk
+                break
+            yield item
+        buffer = buffer[position:]
+
+
+def close_page(future):
+    if future.exception() is None:
+        future.result().close()
+
+
 class GridProxy:
 
+    # Keep-alive session shared by all the instances, created on first use
+    session = None
+    pool_size = 10
+    # Read timeouts in seconds per endpoint, the connection itself has to open within connect_timeout
+    connect_timeout = 5
+    # Items per page of the iterators
+    page_size = 100
+    timeouts = {'nodes': 30, 'nodes/{id}': 15, 'farms': 15, 'twins': 15, 'stats': 10, 'api/stats-summary': 10}
+    default_timeout = 15
+    # Request count and seconds spent per endpoint
+    latency = {}
+    lock = threading.Lock()
+    # Parsed responses by query, copied in and out so callers may change them; the pages drop them once the UI changed the grid
+    cache = ResponseCache(ttl=30, size=256)
+
     def __init__(self, browser):
         self.browser = browser
 
+    @classmethod
+    def get_session(cls):
+        if cls.session is None:
+            # Grid proxy queries are read only, so even the POST ones are safe to retry
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504], allowed_methods=None, raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=cls.pool_size, pool_maxsize=cls.pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            if Cassette.current and Cassette.current.mode != 'off':
+                # Remote queries are recorded or replayed, the local stand-ins are always reached
+                session.mount('https://', CassetteAdapter(Cassette.current, pool_connections=cls.pool_size, pool_maxsize=cls.pool_size, max_retries=retry))
+            cls.session = session
+        return cls.session
+
+    @staticmethod
+    def endpoint(url):
+        # Group the ids in the path, e.g. 'nodes/12' and 'nodes/13' are both 'nodes/{id}'
+        parts = urlparse(url).path.strip('/').split('/')
+        return '/'.join('{id}' if part.isdigit() else part for part in parts)
+
+    def request(self, method, url, stream=False):
+        endpoint = self.endpoint(url)
+        timeout = (self.connect_timeout, self.timeouts.get(endpoint, self.default_timeout))
+        start = time.perf_counter()
+        try:
+            return self.get_session().request(method, url, timeout=timeout, stream=stream)
+        finally:
+            elapsed = time.perf_counter() - start
+            with GridProxy.lock:
+                count, total, slowest = GridProxy.latency.get(endpoint, (0, 0.0, 0.0))
+                GridProxy.latency[endpoint] = (count + 1, total + elapsed, max(slowest, elapsed))
+
+    def post(self, path):
+        return self.request('POST', Base.gridproxy_url + path)
+
+    def fetch(self, path, fresh=False):
+        # Polling loops waiting for the grid to change ask for fresh data, which also refreshes the cache
+        if not fresh:
+            data = self.cache.get(path)
+            if data is not None:
+                return data
+        r = self.post(path)
+        data = r.json()
+        if r.ok:
+            self.cache.put(path, data)
+        return data
+
+    @classmethod
+    def invalidate(cls, endpoint=''):
+        cls.cache.invalidate(endpoint)
+
+    def fetch_page(self, endpoint, filters, page, preload=False):
+        query = dict(filters, page=page, size=self.page_size)
+        r = self.request('POST', Base.gridproxy_url + endpoint + '?' + urlencode(query), stream=True)
+        r.raise_for_status()
+        if preload:
+            # Read the whole body now, parsing it later only walks the buffered content
+            r.content
+        return r
+
+    def iterate(self, endpoint, filters):
+        # Lists and booleans are sent the way the grid proxy expects them, e.g. farm_ids=1,2 and rentable=true
+        filters = {key: ','.join(map(str, value)) if isinstance(value, (list, tuple)) else str(value).lower() if isinstance(value, bool) else value
+                   for key, value in filters.items()}
+        executor = ThreadPoolExecutor(max_workers=1)
+        page = 1
+        current = executor.submit(self.fetch_page, endpoint, filters, page)
+        upcoming = None
+        try:
+            while current is not None:
+                # The response goes back to the pool even when the caller stops in the middle of the page
+                with current.result() as r:
+                    # Download the next page in the background while the current one is parsed and consumed
+                    upcoming = executor.submit(self.fetch_page, endpoint, filters, page + 1, True)
+                    count = 0
+                    for item in iter_json_array(r):
+                        count += 1
+                        yield item
+                page += 1
+                if count < self.page_size:
+                    current = None
+                else:
+                    current, upcoming = upcoming, None
+        finally:
+            # Also reached when the caller stops early; a page already downloading is closed once it arrives
+            if upcoming is not None and not upcoming.cancel():
+                upcoming.add_done_callback(close_page)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_nodes(self, **filters):
+        return self.iterate('nodes', filters)
+
+    def iter_farms(self, **filters):
+        return self.iterate('farms', filters)
+
+    def iter_twins(self, **filters):
+        return self.iterate('twins', filters)
+
+    def get_node(self, node_id, fresh=False):
+        return Node(self.fetch('nodes/' + str(node_id), fresh))
+
+    def get_twin(self, twin_id, fresh=False):
+        return Twin(self.fetch('twins?twin_id=' + str(twin_id), fresh)[0])
+
+    def get_farm(self, farm_id, fresh=False):
+        return Farm(self.fetch('farms?farm_id=' + str(farm_id), fresh)[0])
+
+    @classmethod
+    def connection_stats(cls):
+        # Connections opened against requests sent per host, the gap between both is the keep-alive reuse
+        stats = {}
+        if cls.session is None:
+            return stats
+        for adapter in set(cls.session.adapters.values()):
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools[key]
+                stats[pool.host] = {'connections': pool.num_connections, 'requests': pool.num_requests}
+        return stats
+
+    @classmethod
+    def latency_stats(cls):
+        with cls.lock:
+            return {endpoint: {'requests': count, 'mean': total / count, 'max': slowest} for endpoint, (count, total, slowest) in cls.latency.items()}
+
     def get_rentable_node(self):
-        r = requests.post(Base.gridproxy_url + 'nodes?rentable=true&status=up')
-        node_list = r.json()
-        r = requests.post(Base.gridproxy_url + 'nodes?rented=true&status=up')
-        node_list.extend(r.json())
-        return node_list
+        # The first page of each query is enough, the rest of the grid is never downloaded
+        rentable = islice(self.iter_nodes(rentable=True, status='up'), self.page_size)
+        rented = islice(self.iter_nodes(rented=True, status='up'), self.page_size)
+        return list(rentable) + list(rented)
 
     def get_farm_details(self, farm_name):
-        r = requests.post(Base.gridproxy_url + 'farms?name=' + farm_name)
-        details = r.json()
-        return details
+        return self.fetch('farms?name=' + farm_name)
     
-    def get_dedicate_status(self, node_id):
-        r = requests.post(Base.gridproxy_url + 'nodes/'+ str(node_id))
-        dedicate_status = r.json()
-        return (dedicate_status['rentedByTwinId'])
+    def get_dedicate_status(self, node_id, fresh=False):
+        return self.get_node(node_id, fresh).rented_by_twin_id
     
-    def get_node_ipv4(self, node_id):
-        r = requests.post(Base.gridproxy_url + 'nodes/'+ str(node_id))
-        farm_node = r.json()
-        return (farm_node['publicConfig']['ipv4'])
-
-    def get_node_fee(self, node_id):
-        r = requests.post(Base.gridproxy_url + 'nodes/'+ str(node_id))
-        farm_node = r.json()
-        return (farm_node['extraFee'])/1000
+    def get_node_ipv4(self, node_id, fresh=False):
+        return self.get_node(node_id, fresh).public_config['ipv4']
+
+    def get_node_fee(self, node_id, fresh=False):
+        return self.get_node(node_id, fresh).extra_fee/1000
     
-    def get_twin_address(self, twin_id):
-        r = requests.post(Base.gridproxy_url + 'twins?twin_id='+ twin_id)
-        details = r.json()
-        return details[0]['accountId']
+    def get_twin_address(self, twin_id, fresh=False):
+        return self.get_twin(twin_id, fresh).account_id
     
-    def get_twin_relay(self, twin_id):
-        r = requests.post(Base.gridproxy_url + 'twins?twin_id='+ twin_id)
-        details = r.json()
-        return details[0]['relay']
+    def get_twin_relay(self, twin_id, fresh=False):
+        return self.get_twin(twin_id, fresh).relay
 
-    def get_farm_ips(self, farm_id):
-        r = requests.post(Base.gridproxy_url + 'farms?farm_id='+ farm_id)
-        farm_list = r.json()
-        return len(farm_list[0]['publicIps'])
+    def get_farm_ips(self, farm_id, fresh=False):
+        return len(self.get_farm(farm_id, fresh).public_ips)
 
     def get_twin_node(self, twin_id):
-        r = requests.post(Base.gridproxy_url + 'farms?twin_id=' + twin_id)
-        details = r.json()
-        farms = ''
-        for detail in details:
-            farms += str(detail['farmId']) + ','
-        r = requests.post(Base.gridproxy_url + 'nodes?farm_ids=' + farms[:-1])
-        details = r.json()
-        return details
+        farms = [farm['farmId'] for farm in self.iter_farms(twin_id=twin_id)]
+        if not farms:
+            return []
+        return list(self.iter_nodes(farm_ids=farms))
 
     def get_stats_capicity(self):
         if Base.net == 'main':
             stats_url = 'https://stats.grid.tf/api/stats-summary'
         else:
             stats_url = 'https://stats.' + Base.net + '.grid.tf/api/stats-summary'
-        r = requests.post(stats_url, timeout=10)
+        r = self.request('POST', stats_url)
         stats_json = r.json()
         return list(stats_json.values())[1::] #Avoid selecting HDD capacity; as its not shown in the dashboard anymore.
 
     def get_stats(self):
-        up = requests.get(Base.gridproxy_url + 'stats?status=up', timeout=10).json()
-        standby = requests.get(Base.gridproxy_url + 'stats?status=standby', timeout=10).json()
+        up = self.request('GET', Base.gridproxy_url + 'stats?status=up').json()
+        standby = self.request('GET', Base.gridproxy_url + 'stats?status=standby').json()
+        return self.merge_stats(up, standby)
+
+    @staticmethod
+    def merge_stats(up, standby):
         # Initialize a dictionary to store the merged data
         merged_data = {}
         # Merge simple values, summing if they differ
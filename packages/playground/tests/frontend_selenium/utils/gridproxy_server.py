@@ -0,0 +1,302 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
+import threading
+import random
+import json
+import time
+import sys
+import os
+
+"""
+This module contains a local Grid Proxy stand-in serving nodes, farms, twins and stats from snapshot files.
+"""
+
+# Query parameters which are not filters
+reserved = ('page', 'size', 'ret_count', 'sort_by', 'sort_order', 'randomize', 'balance')
+# Filters whose record field is not the camel case of their name
+aliases = {'rented_by': 'rentedByTwinId', 'farm_ids': 'farmId'}
+# Filters grid proxy accepts per endpoint, as the gridproxy_client builders send them
+filters = {
+    'nodes': ('free_mru', 'free_hru', 'free_sru', 'free_gpu', 'free_ips', 'status', 'city', 'country', 'region', 'farm_name', 'domain',
+              'ipv4', 'ipv6', 'has_ipv6', 'dedicated', 'rentable', 'rented', 'rented_by', 'available_for', 'farm_ids', 'node_id', 'twin_id',
+              'certification_type', 'gpu_available', 'gpu_device_id', 'gpu_device_name', 'gpu_vendor_id', 'gpu_vendor_name', 'has_gpu',
+              'total_cru', 'total_hru', 'total_mru', 'total_sru', 'total_gpu', 'num_gpu', 'owned_by', 'healthy',
+              'city_contains', 'country_contains', 'farm_name_contains'),
+    'farms': ('free_ips', 'total_ips', 'certification_type', 'version', 'dedicated', 'farm_id', 'name', 'name_contains',
+              'pricing_policy_id', 'stellar_address', 'twin_id', 'node_has_ipv6'),
+    'twins': ('account_id', 'twin_id', 'relay', 'public_key'),
+}
+# Filters matching the records with at least that much, instead of the same value
+at_least = ('free_mru', 'free_hru', 'free_sru', 'free_gpu', 'free_ips', 'total_cru', 'total_hru', 'total_mru', 'total_sru', 'total_gpu',
+            'num_gpu', 'total_ips')
+
+
+def camel(name):
+    first, *rest = name.split('_')
+    return first + ''.join(part.capitalize() for part in rest)
+
+
+def field(record, name):
+    # Resources are nested, e.g. 'total_cru' is total_resources.cru and 'free_cru' what is not used of it
+    kind, _, resource = name.partition('_')
+    if kind in ('total', 'used', 'free') and resource in ('cru', 'mru', 'sru', 'hru'):
+        total = (record.get('total_resources') or {}).get(resource, 0)
+        used = (record.get('used_resources') or {}).get(resource, 0)
+        return {'total': total, 'used': used, 'free': total - used}[kind]
+    return record.get(aliases.get(name, camel(name)))
+
+
+def node_value(record, name, snapshots):
+    # Filters grid proxy computes from other fields, or from the farm of the node
+    config = record.get('publicConfig') or {}
+    gpus = record.get('gpus') or []
+    rented = bool(record.get('rentContractId') or record.get('rentedByTwinId'))
+    if name in ('farm_name', 'owned_by', 'free_ips'):
+        farm = next((farm for farm in snapshots.get('farms', []) if farm.get('farmId') == record.get('farmId')), {})
+        if name == 'free_ips':
+            return len([ip for ip in farm.get('publicIps') or [] if not ip.get('contractId')])
+        return farm.get('name' if name == 'farm_name' else 'twinId')
+    if name == 'rented':
+        return rented
+    if name == 'rentable':
+        # A node without contracts is taken as one using no cores, the snapshots do not hold the contracts
+        return not rented and bool(record.get('inDedicatedFarm') or field(record, 'used_cru') == 0)
+    if name in ('ipv4', 'ipv6', 'domain'):
+        return bool(config.get(name))
+    if name == 'has_ipv6':
+        return bool(config.get('ipv6')) or bool(record.get('has_ipv6'))
+    if name in ('num_gpu', 'total_gpu'):
+        return record.get('num_gpu', len(gpus))
+    if name == 'has_gpu':
+        return record.get('num_gpu', len(gpus)) > 0
+    if name == 'free_gpu':
+        return len([gpu for gpu in gpus if not gpu.get('contract')])
+    if name == 'gpu_available':
+        return any(not gpu.get('contract') for gpu in gpus)
+    if name.startswith('gpu_'):
+        # Names are looked for in the device and vendor of its GPUs, ids in the GPU ids holding both
+        key = {'gpu_device_name': 'device', 'gpu_vendor_name': 'vendor'}.get(name, 'id')
+        return ' '.join(str(gpu.get(key, '')) for gpu in gpus)
+    if name == 'region':
+        return (record.get('location') or {}).get('region', record.get('region'))
+    return field(record, name)
+
+
+def farm_value(record, name, snapshots):
+    if name == 'free_ips':
+        return len([ip for ip in record.get('publicIps') or [] if not ip.get('contractId')])
+    if name == 'total_ips':
+        return len(record.get('publicIps') or [])
+    if name.startswith('node_'):
+        # Farms with at least one node matching the node filter
+        nodes = [node for node in snapshots.get('nodes', []) if node.get('farmId') == record.get('farmId')]
+        return any(node_value(node, name[len('node_'):], snapshots) for node in nodes)
+    return field(record, name)
+
+
+def matches(endpoint, record, name, value, snapshots):
+    if name not in filters[endpoint]:
+        raise ValueError('unknown filter ' + name)
+    if name == 'available_for':
+        # Nodes rented by the twin, or free ones outside of dedicated farms
+        renter = record.get('rentedByTwinId') or 0
+        return str(renter) == value or (not renter and not record.get('rentContractId') and not record.get('inDedicatedFarm'))
+    contains = name.endswith('_contains')
+    name = name[:-len('_contains')] if contains else name
+    actual = {'nodes': node_value, 'farms': farm_value}.get(endpoint, lambda record, name, snapshots: field(record, name))(record, name, snapshots)
+    if actual is None:
+        return False
+    if contains or name in ('gpu_device_id', 'gpu_device_name', 'gpu_vendor_id', 'gpu_vendor_name'):
+        return value.lower() in str(actual).lower()
+    if name == 'farm_ids':
+        return str(actual) in value.split(',')
+    if name in at_least:
+        return actual >= int(value)
+    if isinstance(actual, bool):
+        return actual == (value.lower() == 'true')
+    return str(actual).lower() == value.lower()
+
+
+def positive(query, name, default):
+    # Pagination values, answered with a 400 like the unknown filters when they are not positive integers
+    value = query.get(name, str(default))
+    if not value.isdigit() or int(value) == 0:
+        raise ValueError('invalid ' + name + ' ' + value)
+    return int(value)
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'count')
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', '*')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class SnapshotHandler(JSONHandler):
+
+    def do_GET(self):
+        start = time.perf_counter()
+        try:
+            self.answer()
+        finally:
+            self.server.served.append(time.perf_counter() - start)
+
+    def answer(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        query = dict(parse_qsl(url.query))
+        snapshots = self.server.snapshots
+        if parts == ['']:
+            # Liveness check of the dashboard service monitor
+            return self.send_json(200, {'status': 'up'})
+        if parts == ['ping']:
+            return self.send_json(200, {'ping': 'pong'})
+        if parts == ['stats']:
+            return self.send_json(200, self.server.stats(query.get('status', 'up')))
+        if parts[0] not in ('nodes', 'farms', 'twins'):
+            return self.send_json(404, {'error': 'not found'})
+        records = snapshots.get(parts[0], [])
+        if len(parts) == 2:
+            # nodes/{id}
+            for record in records:
+                if str(record.get(camel(parts[0][:-1] + '_id'))) == parts[1]:
+                    return self.send_json(200, record)
+            return self.send_json(404, {'error': parts[0][:-1] + ' not found'})
+        try:
+            records = [record for record in records if all(matches(parts[0], record, name, value, snapshots) for name, value in query.items() if name not in reserved)]
+        except ValueError as e:
+            # Like grid proxy, instead of ignoring what the stand-in cannot answer
+            return self.send_json(400, {'error': str(e)})
+        if 'sort_by' in query:
+            sort_by = query['sort_by']
+            records.sort(key=lambda record: (field(record, sort_by) is None, '' if field(record, sort_by) is None else field(record, sort_by)), reverse=query.get('sort_order') == 'desc')
+        try:
+            page = positive(query, 'page', 1)
+            size = positive(query, 'size', 50)
+        except ValueError as e:
+            return self.send_json(400, {'error': str(e)})
+        headers = {'count': str(len(records))} if query.get('ret_count') == 'true' else {}
+        self.send_json(200, records[(page - 1) * size:page * size], headers)
+
+    do_POST = do_GET
+
+
+class GridProxyServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, snapshot_dir=None, port=0):
+        super().__init__(('127.0.0.1', port), SnapshotHandler)
+        self.snapshot_dir = snapshot_dir
+        self.snapshots = {}
+        for name in ('nodes', 'farms', 'twins', 'stats'):
+            path = os.path.join(snapshot_dir or '', name + '.json')
+            if snapshot_dir and os.path.exists(path):
+                with open(path) as file:
+                    self.snapshots[name] = json.load(file)
+        # Seconds taken by every answered request, for the load runs
+        self.served = []
+        self.thread = None
+
+    def load(self, snapshots):
+        # Serve other data from now on, e.g. a synthetic grid
+        self.snapshots = snapshots
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:' + str(self.server_port) + '/'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def stats(self, status):
+        if status in self.snapshots.get('stats', {}):
+            return self.snapshots['stats'][status]
+        # Without a stats snapshot, count what the node snapshot has
+        nodes = [node for node in self.snapshots.get('nodes', []) if node.get('status') == status]
+        distribution = {}
+        for node in nodes:
+            distribution[node.get('country', '')] = distribution.get(node.get('country', ''), 0) + 1
+        stats = {'nodes': len(nodes), 'accessNodes': 0, 'gpus': 0, 'workloads_number': 0,
+                 'dedicatedNodes': len([node for node in nodes if node.get('dedicated')]),
+                 'farms': len(self.snapshots.get('farms', [])), 'twins': len(self.snapshots.get('twins', [])),
+                 'publicIps': 0, 'gateways': 0, 'contracts': 0, 'nodesDistribution': distribution, 'countries': len(distribution)}
+        for resource in ('cru', 'sru', 'mru', 'hru'):
+            stats['total' + resource.capitalize()] = sum(field(node, 'total_' + resource) for node in nodes)
+        return stats
+
+
+def synthetic_snapshots(nodes, farms, twin_id, seed=0):
+    # A grid of the given size, the same for a given seed, where every farm belongs to the given twin
+    generator = random.Random(seed)
+    countries = ['Belgium', 'Egypt', 'Germany', 'United States', 'Netherlands', 'Tanzania', 'Austria', 'Japan']
+    certifications = ['NotCertified', 'Gold']
+    farm_records = [{
+        'farmId': farm_id, 'name': 'farm_' + str(farm_id), 'twinId': twin_id, 'pricingPolicyId': 1,
+        'certificationType': certifications[farm_id % 10 == 0], 'stellarAddress': '', 'dedicated': False, 'publicIps': [],
+    } for farm_id in range(1, farms + 1)]
+    node_records = []
+    for node_id in range(1, nodes + 1):
+        total = {'cru': generator.choice([4, 8, 16, 32]), 'mru': generator.choice([8, 16, 64]) * 1024 ** 3,
+                 'sru': generator.choice([256, 512, 1024]) * 1024 ** 3, 'hru': generator.choice([0, 2048, 4096]) * 1024 ** 3}
+        used = {resource: int(value * generator.random() / 2) for resource, value in total.items()}
+        country = generator.choice(countries)
+        node_records.append({
+            # Each node has a twin of its own, after the farmer twin
+            'id': 'node-' + str(node_id), 'nodeId': node_id, 'farmId': (node_id - 1) % max(farms, 1) + 1, 'twinId': twin_id + node_id,
+            'country': country, 'city': 'Unknown', 'location': {'country': country, 'city': 'Unknown', 'longitude': 0, 'latitude': 0},
+            'serialNumber': 'SN' + str(100000 + node_id), 'status': generator.choice(['up', 'up', 'up', 'standby', 'down']),
+            'certificationType': 'Diy', 'dedicated': False, 'inDedicatedFarm': False, 'rentContractId': 0, 'rentedByTwinId': 0,
+            'total_resources': total, 'used_resources': used, 'uptime': generator.randint(0, 10 ** 7),
+            'created': 1700000000 + node_id, 'updatedAt': 1710000000, 'gridVersion': 3, 'farmingPolicyId': 1,
+            'publicConfig': {'domain': '', 'gw4': '', 'gw6': '', 'ipv4': '', 'ipv6': ''}, 'extraFee': 0, 'num_gpu': 0, 'healthy': True,
+        })
+    return {'nodes': node_records, 'farms': farm_records, 'twins': []}
+
+
+def record(snapshot_dir, **filters):
+    # Save the live Grid Proxy data of the configured network as snapshots
+    from utils.grid_proxy import GridProxy
+    from utils.base import Base
+    grid_proxy = GridProxy(None)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    snapshots = {
+        'nodes': list(grid_proxy.iter_nodes(**filters)),
+        'farms': list(grid_proxy.iter_farms()),
+        'twins': list(grid_proxy.iter_twins()),
+        'stats': {status: grid_proxy.request('GET', Base.gridproxy_url + 'stats?status=' + status).json() for status in ('up', 'standby')},
+    }
+    for name, data in snapshots.items():
+        with open(os.path.join(snapshot_dir, name + '.json'), 'w') as file:
+            json.dump(data, file)
+
+
+if __name__ == '__main__':
+    # python3 -m utils.gridproxy_server <snapshot_dir>
+    record(sys.argv[1])
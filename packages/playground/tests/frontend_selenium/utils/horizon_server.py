@@ -0,0 +1,142 @@
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlparse
+from utils.gridproxy_server import JSONHandler
+import threading
+import time
+
+"""
+This module contains a local Stellar Horizon and TFT bridge stand-in, holding the accounts and payments in memory.
+"""
+
+# TFT issuer and bridge account of the stand-in, given to the dashboard in place of the network ones
+tft_issuer = 'GA47YZA3PKFUZMPLQ3B5F2E3CJIB57TGGU7SPCQT2WAEYKN766PWIMB3'
+bridge_address = 'GDHJP6TF3UXYXTNEZ2P36J5FH7W4BJJQ4AYYAXC66I2Q2AH5B6O6BCFG'
+# Fees taken by the bridge, the dashboard shows the same ones
+withdraw_fee = 1
+deposit_fee = 1
+
+
+class HorizonHandler(JSONHandler):
+
+    def do_GET(self):
+        # Every answer waits for the latency set by the test
+        time.sleep(self.server.latency)
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if parts[0] == 'accounts' and len(parts) >= 2:
+            account = self.server.account(parts[1])
+            if account is None:
+                return self.send_json(404, {'type': 'https://stellar.org/horizon-errors/not_found', 'title': 'Resource Missing', 'status': 404})
+            if len(parts) == 3 and parts[2] == 'payments':
+                return self.send_json(200, {'_embedded': {'records': self.server.payments_of(parts[1])}})
+            return self.send_json(200, account)
+        self.send_json(404, {'type': 'https://stellar.org/horizon-errors/not_found', 'title': 'Resource Missing', 'status': 404})
+
+
+class HorizonServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0, confirmation_latency=0):
+        super().__init__(('127.0.0.1', port), HorizonHandler)
+        # Seconds added to every Horizon answer, and taken by the bridge to pay a withdrawal out
+        self.latency = latency
+        self.confirmation_latency = confirmation_latency
+        self.lock = threading.Lock()
+        # Address -> TFT balance, only accounts with a TFT trustline are listed
+        self.balances = {}
+        self.payments = []
+        self.thread = None
+        self.fund(bridge_address, 0)
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:' + str(self.server_port)
+
+    @property
+    def env(self):
+        # window.env values pointing the dashboard at the stand-in
+        return {'STELLAR_HORIZON_URL': self.url, 'TFT_ASSET_ISSUER': tft_issuer, 'BRIDGE_TFT_ADDRESS': bridge_address}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def fund(self, address, amount):
+        # Create the account with a TFT trustline if needed, then add the amount to it
+        with self.lock:
+            self.balances[address] = round(self.balances.get(address, 0) + amount, 7)
+
+    def balance(self, address):
+        with self.lock:
+            return self.balances.get(address)
+
+    def account(self, address):
+        with self.lock:
+            if address not in self.balances:
+                return None
+            balance = self.balances[address]
+        return {
+            'id': address, 'account_id': address, 'paging_token': address, 'sequence': '1', 'subentry_count': 1,
+            'last_modified_ledger': 1, 'thresholds': {'low_threshold': 0, 'med_threshold': 0, 'high_threshold': 0},
+            'flags': {'auth_required': False, 'auth_revocable': False, 'auth_immutable': False, 'auth_clawback_enabled': False},
+            'balances': [
+                {'balance': format(balance, '.7f'), 'limit': '922337203685.4775807', 'asset_type': 'credit_alphanum4', 'asset_code': 'TFT', 'asset_issuer': tft_issuer},
+                {'balance': '10000.0000000', 'asset_type': 'native'},
+            ],
+            'signers': [{'weight': 1, 'key': address, 'type': 'ed25519_public_key'}], 'data': {},
+        }
+
+    def payments_of(self, address):
+        with self.lock:
+            return [payment for payment in self.payments if address in (payment['from'], payment['to'])]
+
+    def pay(self, source, destination, amount, memo=''):
+        with self.lock:
+            if self.balances.get(source, 0) < amount:
+                raise ValueError(source + ' cannot pay ' + str(amount) + ' TFT')
+            if destination not in self.balances:
+                raise ValueError(destination + ' has no TFT trustline')
+            self.balances[source] = round(self.balances[source] - amount, 7)
+            self.balances[destination] = round(self.balances[destination] + amount, 7)
+            payment = {'id': str(len(self.payments) + 1), 'type': 'payment', 'from': source, 'to': destination, 'amount': format(amount, '.7f'),
+                       'asset_type': 'credit_alphanum4', 'asset_code': 'TFT', 'asset_issuer': tft_issuer, 'memo': memo}
+            self.payments.append(payment)
+            return payment
+
+    def deposit(self, source, twin_id, amount):
+        # A deposit is a payment to the bridge with the twin as memo, minted on TFChain minus the deposit fee
+        self.pay(source, bridge_address, amount, 'twin_' + str(twin_id))
+        return round(amount - deposit_fee, 7)
+
+    def confirm_withdraw(self, target, amount, latency=None):
+        # Pay the withdrawn amount minus the fee out of the bridge after the confirmation latency
+        self.fund(bridge_address, amount)
+        timer = threading.Timer(self.confirmation_latency if latency is None else latency, self.pay, (bridge_address, target, round(amount - withdraw_fee, 7)))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def withdrawn(self, extrinsic):
+        # TFChain listener paying out the swap_to_stellar extrinsics: their arguments are the target address,
+        # SCALE encoded as its compact length followed by its 56 characters, then the u128 amount in units of 1e-7 TFT
+        data = bytes.fromhex(extrinsic[2:] if extrinsic.startswith('0x') else extrinsic)
+        with self.lock:
+            addresses = list(self.balances)
+        for address in addresses:
+            position = data.find(bytes([56 << 2]) + address.encode())
+            if position != -1 and address != bridge_address:
+                start = position + 1 + len(address)
+                amount = int.from_bytes(data[start:start + 16], 'little') / 10 ** 7
+                return self.confirm_withdraw(address, amount)
+
+    def wait_for_balance(self, address, balance, timeout=30):
+        deadline = time.monotonic() + timeout
+        while self.balance(address) != balance:
+            if time.monotonic() > deadline:
+                raise TimeoutError(address + ' balance is ' + str(self.balance(address)) + ' instead of ' + str(balance))
+            time.sleep(0.1)
+        return balance
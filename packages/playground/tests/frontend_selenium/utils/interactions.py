@@ -0,0 +1,108 @@
+from utils.benchmark import perf_observer
+import importlib
+import threading
+
+"""
+This module contains the interaction profiler, collecting the Interaction to Next Paint and the long tasks of the table sorts and searches.
+"""
+
+# Page object methods profiled as one interaction each
+actions = {
+    'node': ('sort_', 'search_nodes'),
+    'farm': ('farm_table_sorting_by_', 'farm_sorting_', 'search_functionality'),
+}
+
+mark_script = perf_observer + """
+    window.__perf.actionStart = performance.now();
+"""
+
+# Event timing entries are only dispatched after the next paint
+collect_script = """
+    const done = arguments[arguments.length - 1];
+    requestAnimationFrame(() => setTimeout(() => {
+        const perf = window.__perf;
+        // The action left the page it started on
+        if (!perf) return done(null);
+        const tasks = perf.longTasks.filter(([start]) => start >= perf.actionStart);
+        const events = perf.events.filter(([start]) => start >= perf.actionStart);
+        done({
+            inp: events.reduce((longest, [, duration]) => Math.max(longest, duration), 0),
+            interactions: events.length,
+            long_tasks: tasks.length,
+            long_task_ms: tasks.reduce((total, [, duration]) => total + duration, 0),
+            blocking: tasks.reduce((total, [, duration]) => total + Math.max(0, duration - 50), 0),
+        });
+    }));
+"""
+
+
+class InteractionProfiler:
+
+    # Profiler of the run, set from the '--profile-interactions' option
+    current = None
+
+    def __init__(self):
+        self.test = None
+        # Test -> [action, metrics] of every profiled interaction
+        self.tests = {}
+        self.local = threading.local()
+
+    def begin(self, test):
+        self.test = test
+        self.tests[test] = []
+
+    def end(self):
+        self.test = None
+
+    def profile(self, browser, name, function, args, kwargs):
+        # Nested actions belong to the outer one, e.g. a search done while setting up a farm
+        if self.test is None or getattr(self.local, 'active', False):
+            return function(*args, **kwargs)
+        self.local.active = True
+        try:
+            browser.execute_script(mark_script)
+            result = function(*args, **kwargs)
+            metrics = browser.execute_async_script(collect_script)
+            if metrics:
+                self.tests[self.test].append([name, metrics])
+            return result
+        finally:
+            self.local.active = False
+
+    def actions(self, test):
+        return self.tests.get(test, [])
+
+    def over_budget(self, test, inp=None, blocking=None):
+        failures = []
+        for name, metrics in self.actions(test):
+            if inp and metrics['inp'] > inp:
+                failures.append(name + ' INP ' + format(metrics['inp'], '.0f') + ' ms > ' + format(inp, '.0f') + ' ms')
+            if blocking and metrics['blocking'] > blocking:
+                failures.append(name + ' blocking ' + format(metrics['blocking'], '.0f') + ' ms > ' + format(blocking, '.0f') + ' ms')
+        return failures
+
+    def summary(self, test):
+        return '\n'.join(name.ljust(50) + 'INP ' + format(metrics['inp'], '.0f').rjust(5) + ' ms  long tasks ' + str(metrics['long_tasks']).rjust(3) +
+                         ' (' + format(metrics['long_task_ms'], '.0f') + ' ms, blocking ' + format(metrics['blocking'], '.0f') + ' ms)'
+                         for name, metrics in self.actions(test))
+
+
+def profiled(function, name):
+    def wrapper(self, *args, **kwargs):
+        profiler = InteractionProfiler.current
+        if profiler is None:
+            return function(self, *args, **kwargs)
+        return profiler.profile(self.browser, name, function, (self,) + args, kwargs)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def instrument_interactions():
+    for module_name, prefixes in actions.items():
+        module = importlib.import_module('pages.' + module_name)
+        for cls in [value for value in vars(module).values() if isinstance(value, type) and value.__module__ == module.__name__]:
+            for name, value in list(vars(cls).items()):
+                if callable(value) and name.startswith(prefixes) and not getattr(value, '__profiled__', False):
+                    setattr(cls, name, profiled(value, cls.__name__ + '.' + name))
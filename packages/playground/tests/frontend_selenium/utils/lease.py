@@ -0,0 +1,70 @@
+import configparser
+import tempfile
+import hashlib
+import fcntl
+import json
+import os
+from utils.tfchain_node import dev_accounts
+
+"""
+This module contains the account lease pool used to give every test worker its own account.
+"""
+
+class AccountLease:
+
+    # The lease held by the current process, if any
+    current = None
+    lock_dir = os.path.join(tempfile.gettempdir(), 'tfgrid_selenium_leases')
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.account = None
+        self.lock = None
+
+    @staticmethod
+    def load_accounts():
+        config = configparser.ConfigParser()
+        config.read('Config.ini')
+        path = config.get('Utils', 'accounts', fallback='')
+        if (path != ''):
+            with open(path) as file:
+                return json.load(file)
+        try:
+            return json.loads(os.environ["TFCHAIN_ACCOUNTS"])
+        except KeyError:
+            pass
+        # A local TFChain starts with funded dev accounts
+        if (config.get('StandIns', 'tfchain', fallback='') != ''):
+            return dev_accounts
+        return []
+
+    def acquire(self):
+        os.makedirs(self.lock_dir, exist_ok=True)
+        for account in self.accounts:
+            name = hashlib.md5(account['seed'].encode()).hexdigest()
+            lock = open(os.path.join(self.lock_dir, name + '.lock'), 'w')
+            try:
+                # The lock is dropped by the OS if the worker dies, so no lease can leak
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                continue
+            self.account = account
+            self.lock = lock
+            AccountLease.current = self
+            return account
+        raise RuntimeError("All the " + str(len(self.accounts)) + " accounts are leased; add more accounts or run fewer workers.")
+
+    def release(self):
+        if self.lock:
+            fcntl.flock(self.lock, fcntl.LOCK_UN)
+            self.lock.close()
+        self.account = None
+        self.lock = None
+        AccountLease.current = None
+
+    @classmethod
+    def get(cls, key):
+        if cls.current is None:
+            return ''
+        return str(cls.current.account.get(key, ''))
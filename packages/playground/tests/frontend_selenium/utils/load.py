@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+from utils.benchmark import percentile
+import threading
+import time
+
+"""
+This module contains the load generator driving many browser sessions at once through the page object flows.
+"""
+
+# A level degrades when its throughput grows by less than this against the previous level
+min_speedup = 1.1
+# or its p95 is this many times the one of a single session, or more of its flows fail
+max_slowdown = 2
+max_error_rate = 0.01
+
+
+class LoadGenerator:
+
+    """
+    Runs the flows in K concurrent browsers for each level of K, and reports their throughput, latencies and errors.
+    """
+
+    def __init__(self, flows, create_driver, discard_driver, duration=60, server=None):
+        # Flow name -> function taking a browser
+        self.flows = flows
+        self.create_driver = create_driver
+        self.discard_driver = discard_driver
+        self.duration = duration
+        # Grid Proxy stand-in whose answer times are reported along, if any
+        self.server = server
+        self.levels = {}
+        self.lock = threading.Lock()
+
+    def session(self, driver, index, deadline, results):
+        # Each session starts at another flow, so every flow runs at each level
+        names = list(self.flows)
+        turn = index
+        while time.monotonic() < deadline:
+            name = names[turn % len(names)]
+            turn += 1
+            start = time.perf_counter()
+            try:
+                self.flows[name](driver)
+                error = None
+            except Exception as e:
+                error = type(e).__name__ + ': ' + str(e).splitlines()[0] if str(e) else type(e).__name__
+            with self.lock:
+                results.append((name, time.perf_counter() - start, error))
+
+    def run_level(self, sessions):
+        results = []
+        with ThreadPoolExecutor(sessions) as executor:
+            drivers = list(executor.map(lambda _: self.create_driver(), range(sessions)))
+        served = len(self.server.served) if self.server else 0
+        # Sessions are started together, the driver creation is not measured
+        start = time.monotonic()
+        deadline = start + self.duration
+        with ThreadPoolExecutor(sessions) as executor:
+            for index, driver in enumerate(drivers):
+                executor.submit(self.session, driver, index, deadline, results)
+        elapsed = time.monotonic() - start
+        for driver in drivers:
+            self.discard_driver(driver)
+        self.levels[sessions] = self.summary(results, elapsed, self.server.served[served:] if self.server else [])
+        return self.levels[sessions]
+
+    @staticmethod
+    def summary(results, elapsed, served):
+        flows = {}
+        for name, seconds, error in results:
+            flow = flows.setdefault(name, {'runs': 0, 'errors': [], 'seconds': []})
+            flow['runs'] += 1
+            if error:
+                flow['errors'].append(error)
+            else:
+                flow['seconds'].append(seconds)
+        completed = [seconds for _, seconds, error in results if not error]
+        level = {
+            'runs': len(results),
+            'throughput': len(completed) / elapsed if elapsed else 0,
+            'error_rate': (len(results) - len(completed)) / len(results) if results else 0,
+            'p50': percentile(completed, 50) if completed else None,
+            'p95': percentile(completed, 95) if completed else None,
+            'flows': {name: {'runs': flow['runs'], 'error_rate': len(flow['errors']) / flow['runs'],
+                             'p50': percentile(flow['seconds'], 50) if flow['seconds'] else None,
+                             'p95': percentile(flow['seconds'], 95) if flow['seconds'] else None,
+                             # The distinct errors, to tell a timeout from a crash
+                             'errors': sorted(set(flow['errors']))} for name, flow in flows.items()},
+        }
+        if served:
+            level['gridproxy'] = {'requests': len(served), 'per_second': len(served) / elapsed,
+                                  'p50': percentile(served, 50), 'p95': percentile(served, 95)}
+        return level
+
+    def run(self, levels):
+        for sessions in levels:
+            self.run_level(sessions)
+        return self.report()
+
+    def degraded(self):
+        # The first level where adding sessions stopped paying off, or None
+        ordered = sorted(self.levels)
+        if not ordered:
+            return None
+        first = self.levels[ordered[0]]
+        previous = None
+        for sessions in ordered:
+            level = self.levels[sessions]
+            if level['error_rate'] > max_error_rate:
+                return sessions
+            if level['p95'] is None or (first['p95'] and level['p95'] > first['p95'] * max_slowdown):
+                return sessions
+            if previous is not None and level['throughput'] < self.levels[previous]['throughput'] * min_speedup:
+                return sessions
+            previous = sessions
+        return None
+
+    def report(self):
+        return {'duration': self.duration, 'levels': self.levels, 'degraded_at': self.degraded()}
@@ -0,0 +1,139 @@
+from utils.wait_policy import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from pages.dashboard import DashboardPage
+from utils.utils import generate_string
+from utils.base import Base
+
+"""
+This module contains a cache of logged in wallet states, one per seed.
+"""
+
+class LoginCache:
+
+    # Storage snapshots of a logged in playground, keyed by seed and kept for the whole session
+    snapshots = {}
+
+    capture_script = """
+        const done = arguments[arguments.length - 1];
+        const state = {local: {}, session: {}, indexed: []};
+        for (let i = 0; i < localStorage.length; i++) {
+            state.local[localStorage.key(i)] = localStorage.getItem(localStorage.key(i));
+        }
+        for (let i = 0; i < sessionStorage.length; i++) {
+            state.session[sessionStorage.key(i)] = sessionStorage.getItem(sessionStorage.key(i));
+        }
+        const dump = info => new Promise(resolve => {
+            const request = indexedDB.open(info.name, info.version);
+            request.onerror = () => resolve(null);
+            request.onsuccess = () => {
+                const db = request.result;
+                const names = Array.from(db.objectStoreNames);
+                const database = {name: info.name, version: info.version, stores: {}};
+                if (!names.length) {
+                    db.close();
+                    return resolve(database);
+                }
+                const tx = db.transaction(names, 'readonly');
+                names.forEach(name => {
+                    const store = tx.objectStore(name);
+                    const records = [];
+                    database.stores[name] = {keyPath: store.keyPath, autoIncrement: store.autoIncrement, records: records};
+                    store.openCursor().onsuccess = event => {
+                        const cursor = event.target.result;
+                        if (cursor) {
+                            records.push({key: cursor.primaryKey, value: cursor.value});
+                            cursor.continue();
+                        }
+                    };
+                });
+                tx.oncomplete = () => { db.close(); resolve(database); };
+                tx.onerror = () => { db.close(); resolve(null); };
+            };
+        });
+        indexedDB.databases()
+            .then(infos => Promise.all(infos.map(dump)))
+            .then(databases => {
+                state.indexed = databases.filter(database => database);
+                done(state);
+            });
+    """
+
+    restore_script = """
+        const state = arguments[0];
+        const done = arguments[arguments.length - 1];
+        localStorage.clear();
+        sessionStorage.clear();
+        Object.entries(state.local).forEach(([key, value]) => localStorage.setItem(key, value));
+        Object.entries(state.session).forEach(([key, value]) => sessionStorage.setItem(key, value));
+        const load = database => new Promise(resolve => {
+            const request = indexedDB.open(database.name, database.version);
+            request.onerror = () => resolve();
+            request.onupgradeneeded = () => {
+                Object.entries(database.stores).forEach(([name, store]) => {
+                    if (!request.result.objectStoreNames.contains(name)) {
+                        request.result.createObjectStore(name, {keyPath: store.keyPath, autoIncrement: store.autoIncrement});
+                    }
+                });
+            };
+            request.onsuccess = () => {
+                const db = request.result;
+                const names = Object.keys(database.stores).filter(name => db.objectStoreNames.contains(name));
+                if (!names.length) {
+                    db.close();
+                    return resolve();
+                }
+                const tx = db.transaction(names, 'readwrite');
+                names.forEach(name => {
+                    const store = tx.objectStore(name);
+                    database.stores[name].records.forEach(record => {
+                        store.keyPath === null ? store.put(record.value, record.key) : store.put(record.value);
+                    });
+                });
+                tx.oncomplete = () => { db.close(); resolve(); };
+                tx.onerror = () => { db.close(); resolve(); };
+            };
+        });
+        Promise.all(state.indexed.map(load)).then(() => done(true));
+    """
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    def login(self, seed, email):
+        snapshot = LoginCache.snapshots.get(seed)
+        if snapshot:
+            if self.restore(snapshot):
+                return
+            # Drop the stale wallet so the profile manager opens on 'Connect your Wallet' again
+            LoginCache.invalidate(seed)
+            self.browser.execute_script("localStorage.clear(); sessionStorage.clear();")
+        self.ui_login(seed, email)
+        LoginCache.snapshots[seed] = self.browser.execute_async_script(self.capture_script)
+
+    def ui_login(self, seed, email):
+        dashboard_page = DashboardPage(self.browser)
+        dashboard_page.open_and_load()
+        dashboard_page.import_account(seed)
+        dashboard_page.click_button(dashboard_page.connect_your_wallet(email, generate_string()))
+        WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(DashboardPage.logout_button))
+
+    def restore(self, snapshot):
+        # Storage is scoped to the dashboard origin, so it has to be loaded before injecting the state
+        if self.browser.current_url != Base.base_url:
+            self.browser.get(Base.base_url)
+        self.browser.execute_async_script(self.restore_script, snapshot)
+        # The profile manager logs in by itself once it finds the wallet and the session password
+        self.browser.refresh()
+        try:
+            WebDriverWait(self.browser, 30).until(EC.visibility_of_element_located(DashboardPage.logout_button))
+        except TimeoutException:
+            return False
+        return True
+
+    @classmethod
+    def invalidate(cls, seed=None):
+        if seed is None:
+            cls.snapshots.clear()
+        else:
+            cls.snapshots.pop(seed, None)
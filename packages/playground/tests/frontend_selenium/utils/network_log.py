@@ -0,0 +1,200 @@
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from utils.waits import wait_until_settled
+import datetime
+import json
+import os
+import re
+
+"""
+This module contains the network log of the browsers: the HAR export and the request auditor.
+"""
+
+# A request starting this soon after another one ended is taken as waiting for it
+chain_gap = 0.05
+# Requests waiting longer than this before being sent are blocked by the browser
+blocked_after = 0.1
+
+
+class PerformanceLog:
+
+    """
+    Messages of the chromedriver performance log of a browser, the network events and the trace, read as they come.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.messages = []
+
+    def read(self):
+        for entry in self.driver.get_log('performance'):
+            self.messages.append(json.loads(entry['message'])['message'])
+        return self.messages
+
+    def clear(self):
+        self.read()
+        self.messages = []
+
+
+def network_requests(messages):
+    # Join the Network events of each request, in the order they were sent
+    requests = {}
+    sockets = {}
+    for message in messages:
+        method, params = message['method'], message.get('params', {})
+        if not method.startswith('Network.') or 'requestId' not in params:
+            continue
+        if method == 'Network.webSocketCreated':
+            sockets[params['requestId']] = params['url']
+            continue
+        if method == 'Network.webSocketFrameSent':
+            # Each JSON-RPC call sent to TFChain counts as a request, named after its method
+            payload = params['response'].get('payloadData', '')
+            try:
+                call = json.loads(payload).get('method', '')
+            except (ValueError, AttributeError):
+                call = ''
+            requests[params['requestId'] + ':' + str(len(requests))] = {
+                'method': 'WS', 'url': sockets.get(params['requestId'], '') + ' ' + call, 'type': 'WebSocket',
+                'start': params['timestamp'], 'wall': 0, 'sent': None, 'end': params['timestamp'], 'status': 0, 'status_text': '',
+                'mime': '', 'bytes': len(payload), 'failed': '', 'request_headers': {}, 'response_headers': {}, 'protocol': 'websocket',
+            }
+            continue
+        request = requests.get(params['requestId'])
+        if method == 'Network.requestWillBeSent':
+            if request is not None and params.get('redirectResponse'):
+                # Each redirect hop is a request of its own
+                requests[params['requestId'] + ':' + str(request['start'])] = request
+            requests[params['requestId']] = {
+                'method': params['request']['method'], 'url': params['request']['url'], 'type': params.get('type', ''),
+                'start': params['timestamp'], 'wall': params['wallTime'], 'sent': None, 'end': None, 'status': 0, 'status_text': '',
+                'mime': '', 'bytes': 0, 'failed': '', 'request_headers': params['request'].get('headers', {}), 'response_headers': {},
+                'protocol': '',
+            }
+        elif request is None:
+            continue
+        elif method == 'Network.responseReceived':
+            response = params['response']
+            request.update(status=response['status'], status_text=response.get('statusText', ''), mime=response.get('mimeType', ''),
+                           response_headers=response.get('headers', {}), protocol=response.get('protocol', ''))
+            if response.get('timing'):
+                request['sent'] = response['timing']['requestTime'] + response['timing']['sendStart'] / 1000
+        elif method == 'Network.loadingFinished':
+            request.update(end=params['timestamp'], bytes=params.get('encodedDataLength', 0))
+        elif method == 'Network.loadingFailed':
+            request.update(end=params['timestamp'], failed=params.get('blockedReason') or params.get('errorText', 'failed'))
+    return sorted(requests.values(), key=lambda request: request['start'])
+
+
+class NetworkAudit:
+
+    def __init__(self, requests):
+        # Only what the page fetches, not its own documents, scripts and images
+        self.requests = [request for request in requests if request['type'] in ('Fetch', 'XHR', 'WebSocket', 'EventSource') or not request['type']]
+        self.all_requests = requests
+
+    def urls(self, fragment=''):
+        return [request['url'] for request in self.requests if fragment in request['url']]
+
+    def count(self, fragment):
+        # e.g. count('nodes?') counts the node list queries
+        return len(self.urls(fragment))
+
+    @property
+    def bytes(self):
+        return sum(request['bytes'] for request in self.all_requests)
+
+    def duplicates(self):
+        # The same query sent more than once
+        counts = {}
+        for request in self.requests:
+            key = request['method'] + ' ' + request['url']
+            counts[key] = counts.get(key, 0) + 1
+        return {key: count for key, count in counts.items() if count > 1}
+
+    def failed(self):
+        return [request['url'] + ' ' + request['failed'] for request in self.all_requests if request['failed']]
+
+    def blocked(self):
+        # Requests queued by the browser, e.g. over the connections limit of a host
+        return [request['url'] for request in self.requests if request['sent'] and request['sent'] - request['start'] > blocked_after]
+
+    def serial_chain(self):
+        # Longest chain of requests each starting right after the previous one ended, the waterfall a page waits for
+        chains = []
+        for request in self.requests:
+            previous = [chain for chain in chains if chain[-1]['end'] and 0 <= request['start'] - chain[-1]['end'] <= chain_gap]
+            chains.append(max(previous, key=len, default=[]) + [request])
+        return [request['url'] for request in max(chains, key=len, default=[])]
+
+    def hosts(self):
+        counts = {}
+        for request in self.requests:
+            host = urlparse(request['url']).netloc
+            counts[host] = counts.get(host, 0) + 1
+        return counts
+
+    def summary(self):
+        return {'requests': len(self.requests), 'bytes': self.bytes, 'hosts': self.hosts(), 'duplicates': self.duplicates(),
+                'failed': self.failed(), 'blocked': self.blocked(), 'serial_chain': self.serial_chain()}
+
+
+def har_headers(headers):
+    return [{'name': name, 'value': str(value)} for name, value in headers.items()]
+
+
+def to_har(requests, audit=None):
+    entries = []
+    for request in requests:
+        if request['method'] == 'WS':
+            # Websocket frames are in the audit only
+            continue
+        url = urlparse(request['url'])
+        elapsed = ((request['end'] or request['start']) - request['start']) * 1000
+        wait = ((request['sent'] or request['start']) - request['start']) * 1000
+        entries.append({
+            'startedDateTime': datetime.datetime.fromtimestamp(request['wall'], datetime.timezone.utc).isoformat(),
+            'time': elapsed,
+            'request': {'method': request['method'], 'url': request['url'], 'httpVersion': request['protocol'], 'headers': har_headers(request['request_headers']),
+                        'queryString': [{'name': name, 'value': value} for name, _, value in (part.partition('=') for part in url.query.split('&') if part)],
+                        'cookies': [], 'headersSize': -1, 'bodySize': -1},
+            'response': {'status': request['status'], 'statusText': request['status_text'] or request['failed'], 'httpVersion': request['protocol'],
+                         'headers': har_headers(request['response_headers']), 'cookies': [], 'content': {'size': request['bytes'], 'mimeType': request['mime']},
+                         'redirectURL': '', 'headersSize': -1, 'bodySize': request['bytes']},
+            'cache': {},
+            'timings': {'blocked': wait, 'send': 0, 'wait': elapsed - wait, 'receive': 0},
+        })
+    har = {'log': {'version': '1.2', 'creator': {'name': 'frontend_selenium', 'version': '1'}, 'pages': [], 'entries': entries}}
+    if audit is not None:
+        har['log']['_audit'] = audit.summary()
+    return har
+
+
+def save_har(directory, test, requests):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, re.sub(r'[^\w.-]+', '_', test) + '.har')
+    with open(path, 'w') as file:
+        json.dump(to_har(requests, NetworkAudit(requests)), file, indent=1)
+    return path
+
+
+class NetworkMonitor:
+
+    """
+    Gives the tests the requests sent by the browser while a block of the test runs.
+    """
+
+    def __init__(self, log):
+        self.log = log
+
+    @contextmanager
+    def capture(self, settle=True):
+        # with network.capture() as calls: NodePage(browser).navigate()
+        # assert calls.count('nodes?') <= 3
+        start = len(self.log.read())
+        audit = NetworkAudit([])
+        yield audit
+        if settle:
+            # Let the page finish what the block started
+            wait_until_settled(self.log.driver)
+        audit.__init__(network_requests(self.log.read()[start:]))
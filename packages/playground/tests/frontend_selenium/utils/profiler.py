@@ -0,0 +1,99 @@
+import threading
+import json
+import sys
+
+"""
+This module contains the WebDriver command profiler, counting and timing the chromedriver round trips of every test.
+"""
+
+class CommandProfiler:
+
+    # Profiler of the run, every browser reports its commands to it
+    current = None
+
+    def __init__(self):
+        self.test = None
+        # Test -> {'commands', 'seconds', 'by_command', 'by_method', 'by_locator'}, the groups holding [count, seconds]
+        self.tests = {}
+        # Element id -> the locator it was found with, to group the element commands by locator
+        self.locators = {}
+        self.lock = threading.Lock()
+
+    def begin(self, test):
+        with self.lock:
+            self.test = test
+            self.tests[test] = {'commands': 0, 'seconds': 0.0, 'by_command': {}, 'by_method': {}, 'by_locator': {}}
+
+    def end(self):
+        with self.lock:
+            self.test = None
+            self.locators.clear()
+
+    def count(self, test):
+        return self.tests.get(test, {}).get('commands', 0)
+
+    @staticmethod
+    def caller():
+        # The page object method, or else the test, issuing the command
+        frame = sys._getframe(3)
+        test = None
+        while frame:
+            module = frame.f_globals.get('__name__', '')
+            if module.startswith('pages.'):
+                owner = frame.f_locals.get('self')
+                return (type(owner).__name__ + '.' if owner is not None else '') + frame.f_code.co_name
+            if test is None and frame.f_code.co_name.startswith('test_'):
+                test = frame.f_code.co_name
+            frame = frame.f_back
+        return test or 'fixtures'
+
+    def record(self, command, params, response, seconds):
+        if self.test is None:
+            return
+        method = self.caller()
+        if 'using' in params:
+            locator = params['using'] + ': ' + str(params['value'])
+        else:
+            locator = self.locators.get(params.get('id'))
+        with self.lock:
+            stats = self.tests.get(self.test)
+            if stats is None:
+                return
+            stats['commands'] += 1
+            stats['seconds'] += seconds
+            for group, key in (('by_command', command), ('by_method', method), ('by_locator', locator)):
+                if key is None:
+                    continue
+                entry = stats[group].setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+            # Remember which locator found the returned elements
+            if locator and 'using' in params and response:
+                value = response.get('value')
+                for element in value if isinstance(value, list) else [value]:
+                    if isinstance(element, dict):
+                        for element_id in element.values():
+                            self.locators[element_id] = locator
+
+    def ranked(self, group, top=10):
+        # Merge a group over all the tests, the most expensive first
+        merged = {}
+        for stats in self.tests.values():
+            for key, (count, seconds) in stats[group].items():
+                entry = merged.setdefault(key, [0, 0.0])
+                entry[0] += count
+                entry[1] += seconds
+        return sorted(merged.items(), key=lambda item: item[1][1], reverse=True)[:top]
+
+    def report(self):
+        return {
+            'tests': sorted(([test, stats['commands'], stats['seconds']] for test, stats in self.tests.items()), key=lambda item: item[2], reverse=True),
+            'methods': self.ranked('by_method', None),
+            'locators': [item for item in self.ranked('by_locator', None) if item[1][0] > 1],
+            'commands': self.ranked('by_command', None),
+            'details': self.tests,
+        }
+
+    def save(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=1)
@@ -0,0 +1,47 @@
+"""
+This module contains the Grid Proxy records, holding the fields the tests read from a node, twin or farm.
+"""
+
+class Node:
+
+    __slots__ = ('node_id', 'farm_id', 'twin_id', 'country', 'city', 'serial_number', 'status', 'certification_type',
+                 'rented_by_twin_id', 'extra_fee', 'public_config')
+
+    def __init__(self, data):
+        self.node_id = data['nodeId']
+        self.farm_id = data['farmId']
+        self.twin_id = data.get('twinId')
+        self.country = data.get('country', '')
+        self.city = data.get('city', '')
+        self.serial_number = data.get('serialNumber', '')
+        self.status = data.get('status', '')
+        self.certification_type = data.get('certificationType', '')
+        self.rented_by_twin_id = data.get('rentedByTwinId', 0)
+        self.extra_fee = data.get('extraFee', 0)
+        self.public_config = data.get('publicConfig') or {}
+
+
+class Twin:
+
+    __slots__ = ('twin_id', 'account_id', 'relay', 'public_key')
+
+    def __init__(self, data):
+        self.twin_id = data.get('twinId')
+        self.account_id = data['accountId']
+        self.relay = data.get('relay', '')
+        self.public_key = data.get('publicKey', '')
+
+
+class Farm:
+
+    __slots__ = ('farm_id', 'name', 'twin_id', 'pricing_policy_id', 'certification_type', 'stellar_address', 'dedicated', 'public_ips')
+
+    def __init__(self, data):
+        self.farm_id = data['farmId']
+        self.name = data['name']
+        self.twin_id = data.get('twinId')
+        self.pricing_policy_id = data.get('pricingPolicyId', 0)
+        self.certification_type = data.get('certificationType', '')
+        self.stellar_address = data.get('stellarAddress', '')
+        self.dedicated = data.get('dedicated', False)
+        self.public_ips = data.get('publicIps') or []
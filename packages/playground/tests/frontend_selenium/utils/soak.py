@@ -0,0 +1,87 @@
+from selenium.webdriver.common.bidi import cdp
+import requests
+import trio
+
+"""
+This module contains the memory soak helpers: the CDP memory samples, their trend and the heap snapshot diff.
+"""
+
+# Performance.getMetrics values followed across the cycles
+tracked_metrics = ('JSHeapUsedSize', 'Nodes', 'JSEventListeners')
+
+
+def sample(driver):
+    # Collect the garbage first, so only what is still referenced is counted
+    driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+    driver.execute_cdp_cmd('Performance.enable', {})
+    metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    return {metric['name']: metric['value'] for metric in metrics if metric['name'] in tracked_metrics}
+
+
+def slope(values):
+    # Least squares growth per cycle
+    count = len(values)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    variance = sum((x - mean_x) ** 2 for x in range(count))
+    return covariance / variance
+
+
+def heap_snapshot(driver):
+    # Snapshots are streamed as CDP events, which only a websocket connection to the page receives
+    target = driver.execute_cdp_cmd('Target.getTargetInfo', {})['targetInfo']['targetId']
+    address = driver.capabilities['goog:chromeOptions']['debuggerAddress']
+    version = requests.get('http://' + address + '/json/version').json()
+    return trio.run(take_snapshot, version['webSocketDebuggerUrl'], version['Browser'].split('/')[1].split('.')[0], target)
+
+
+async def take_snapshot(url, version, target):
+    devtools = cdp.import_devtools(version)
+    chunks = []
+    async with cdp.open_cdp(url) as connection:
+        session = await connection.connect_session(devtools.target.TargetID(target))
+        received = session.listen(devtools.heap_profiler.AddHeapSnapshotChunk, buffer_size=1000000)
+        await session.execute(devtools.heap_profiler.enable())
+        # Every chunk is sent before the command returns
+        await session.execute(devtools.heap_profiler.take_heap_snapshot(report_progress=False))
+        while True:
+            try:
+                chunks.append(received.receive_nowait().chunk)
+            except trio.WouldBlock:
+                break
+        await connection.execute(devtools.target.detach_from_target(session_id=session.session_id))
+    return ''.join(chunks)
+
+
+def heap_summary(snapshot):
+    # (node type, constructor or name) -> [count, self size] of a parsed .heapsnapshot
+    meta = snapshot['snapshot']['meta']
+    fields = meta['node_fields']
+    types = meta['node_types'][0]
+    width = len(fields)
+    type_index, name_index, size_index = fields.index('type'), fields.index('name'), fields.index('self_size')
+    nodes = snapshot['nodes']
+    strings = snapshot['strings']
+    summary = {}
+    for offset in range(0, len(nodes), width):
+        node_type = types[nodes[offset + type_index]]
+        if node_type in ('hidden', 'synthetic', 'code', 'concatenated string', 'sliced string'):
+            continue
+        key = node_type + ' ' + strings[nodes[offset + name_index]][:80]
+        entry = summary.setdefault(key, [0, 0])
+        entry[0] += 1
+        entry[1] += nodes[offset + size_index]
+    return summary
+
+
+def heap_diff(before, after, top=20):
+    # The objects whose retained count grew the most between two snapshot summaries
+    growth = []
+    for key, (count, size) in after.items():
+        old_count, old_size = before.get(key, (0, 0))
+        if count > old_count:
+            growth.append({'object': key, 'count': count - old_count, 'size': size - old_size})
+    return sorted(growth, key=lambda item: (item['size'], item['count']), reverse=True)[:top]
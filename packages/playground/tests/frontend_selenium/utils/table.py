@@ -0,0 +1,86 @@
+from utils.waits import wait_until_settled
+
+"""
+This module contains the table reader serialising a whole Vuetify data table in one script.
+"""
+
+# Shared by the scripts: the text of an element, or the value of an input
+text_function = """
+    const text = node => ['INPUT', 'TEXTAREA'].includes(node.tagName) ? node.value : node.innerText.trim();
+    const all = (xpath, context) => {
+        const result = document.evaluate(xpath, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        return Array.from({length: result.snapshotLength}, (_, i) => result.snapshotItem(i));
+    };
+"""
+
+table_script = text_function + """
+    const [rowsXpath, detailFields] = arguments;
+    const trs = all(rowsXpath, document);
+    const table = trs.length ? trs[0].closest('table') : null;
+    const headers = table ? Array.from(table.querySelectorAll(':scope > thead th')).map(text) : [];
+    const rows = [];
+    trs.forEach(tr => {
+        if (tr.classList.contains('v-data-table-rows-no-data')) return;
+        // An expanded row is a single cell spanning the table, holding the details of the row above it
+        if (tr.children.length === 1 && tr.children[0].colSpan > 1 && rows.length) {
+            const details = {};
+            Object.entries(detailFields).forEach(([name, xpath]) => details[name] = all(xpath, tr).map(text));
+            rows[rows.length - 1].details = details;
+            return;
+        }
+        rows.push({cells: Array.from(tr.children).map(text), details: null});
+    });
+    return {headers: headers, rows: rows};
+"""
+
+fields_script = text_function + """
+    const fields = arguments[0];
+    const values = {};
+    Object.entries(fields).forEach(([name, xpath]) => {
+        const nodes = all(xpath, document);
+        values[name] = nodes.length ? text(nodes[0]) : null;
+    });
+    return values;
+"""
+
+
+class TableRow:
+
+    def __init__(self, headers, cells, details=None):
+        self.headers = headers
+        self.cells = cells
+        # Texts of the expanded panel of the row per detail field, None while the row is collapsed
+        self.details = details
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.cells[self.headers.index(key)]
+        return self.cells[key]
+
+    def detail(self, name):
+        values = (self.details or {}).get(name) or ['']
+        return values[0]
+
+    def __repr__(self):
+        return 'TableRow(' + repr(self.cells) + ')'
+
+
+class DataTable:
+
+    def __init__(self, browser, rows_xpath):
+        self.browser = browser
+        self.rows_xpath = rows_xpath
+
+    def rows(self, details=None):
+        # Read the table once it rendered the last sort, search or page change
+        wait_until_settled(self.browser)
+        table = self.browser.execute_script(table_script, self.rows_xpath, details or {})
+        return [TableRow(table['headers'], row['cells'], row['details']) for row in table['rows']]
+
+    def column(self, index):
+        return [row[index] for row in self.rows()]
+
+
+def read_fields(browser, fields):
+    # Texts (or input values) of the first element matching each xpath, None for the missing ones
+    return browser.execute_script(fields_script, fields)
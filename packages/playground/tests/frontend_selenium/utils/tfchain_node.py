@@ -0,0 +1,161 @@
+from trio_websocket import serve_websocket, open_websocket_url, ConnectionClosed
+import subprocess
+import threading
+import requests
+import socket
+import signal
+import shlex
+import json
+import time
+import trio
+import os
+
+"""
+This module contains a local TFChain stand-in: a dev chain node behind a websocket proxy sealing a block for every submitted extrinsic.
+"""
+
+# Accounts endowed by the dev chain genesis, logged in with their hex seed. 'ss58' is their chain address;
+# they hold no Stellar address, so 'address' is left empty and the configured one is used
+dev_accounts = [
+    {'name': 'Alice', 'seed': 'e5be9a5092b81bca64be81d212e7f2f9eba183bb7a90954f7b76361f6edb5c0a', 'address': '', 'ss58': '5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY'},
+    {'name': 'Bob', 'seed': '398f0c28f98885e046333d4a41c19cee4c37368a9832c6502f6cfd182e2aef89', 'address': '', 'ss58': '5FHneW46xGXgs5mUiveU4sbTyGBzmstUspZC92UhjJM694ty'},
+    {'name': 'Charlie', 'seed': 'bc1ede780f784bb6991a585e4f4e61522c14e1cae6ad0895fb57b9a205a8f938', 'address': '', 'ss58': '5FLSigC9HGRKVhB9FiEo4Y3koPsNmBmLJbpXg2mp1hXcS59Y'},
+    {'name': 'Dave', 'seed': '868020ae0687dda7d57565093a69090211449845a7e11453612800b663307246', 'address': '', 'ss58': '5DAAnrj7VHTznn2AWBemMuyBwZWs6FNFjdyVXUeYum3PTXFy'},
+    {'name': 'Eve', 'seed': '786ad0e2df456fe43dd1f91ebca22e235bc162e0bb8d53c633e8c85b2af68b7a', 'address': '', 'ss58': '5HGjWAeFDfFCWPsjFQdVV2Msvz2XtMktvgocEZcCj68kUMaw'},
+    {'name': 'Ferdie', 'seed': '42438b7883391c05512a938e36c2df0131e088b3756d6aa7a755fbff19d2f842', 'address': '', 'ss58': '5CiPPseXPECbkjWCa6MnjNokrgYjMqmKndv2rSnekmSK2DjL'},
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TFChainNode:
+
+    # Calls adding an extrinsic to the pool, answered by sealing a block right away
+    submit_methods = ('author_submitExtrinsic', 'author_submitAndWatchExtrinsic')
+    # Metadata responses are bigger than the websocket default of 1 MiB
+    max_message_size = 64 * 1024 * 1024
+
+    def __init__(self, command, startup_timeout=120):
+        # e.g. 'tfchain --dev --tmp --rpc-port {port}', '{port}' is replaced by a free port
+        self.command = command
+        self.startup_timeout = startup_timeout
+        self.accounts = dev_accounts
+        self.rpc_port = None
+        self.proxy_port = None
+        self.process = None
+        self.instant = False
+        # Called with the hex of every extrinsic the pool accepted, e.g. by the bridge stand-in
+        self.listeners = []
+        self.thread = None
+        self.token = None
+        self.scope = None
+        self.ready = threading.Event()
+
+    @property
+    def url(self):
+        return 'ws://127.0.0.1:' + str(self.proxy_port)
+
+    def start(self):
+        self.rpc_port = free_port()
+        self.process = subprocess.Popen(shlex.split(self.command.format(port=self.rpc_port)), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                self.rpc('system_health')
+                break
+            except (requests.ConnectionError, RuntimeError):
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError("The TFChain stand-in did not start: " + self.command)
+                time.sleep(0.5)
+        # Nodes built with manual sealing produce blocks on demand, the others keep their block time
+        self.instant = 'engine_createBlock' in self.rpc('rpc_methods')['methods']
+        self.thread = threading.Thread(target=trio.run, args=(self.serve,), daemon=True)
+        self.thread.start()
+        self.ready.wait(10)
+
+    def stop(self):
+        if self.token:
+            try:
+                trio.from_thread.run_sync(self.scope.cancel, trio_token=self.token)
+            except trio.RunFinishedError:
+                pass
+            self.thread.join(5)
+        if self.process and self.process.poll() is None:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(30)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+
+    def rpc(self, method, params=None):
+        r = requests.post('http://127.0.0.1:' + str(self.rpc_port), json={'id': 1, 'jsonrpc': '2.0', 'method': method, 'params': params or []}, timeout=10)
+        data = r.json()
+        if 'error' in data:
+            raise RuntimeError(method + ': ' + str(data['error']))
+        return data['result']
+
+    def block_number(self):
+        return int(self.rpc('chain_getHeader')['number'], 16)
+
+    def seal(self, timeout=30):
+        # Include the pending extrinsics in a new block, or wait for the next one without manual sealing
+        if self.instant:
+            return self.rpc('engine_createBlock', [True, True])
+        current = self.block_number()
+        deadline = time.monotonic() + timeout
+        while self.block_number() == current and time.monotonic() < deadline:
+            time.sleep(0.2)
+
+    async def serve(self):
+        self.token = trio.lowlevel.current_trio_token()
+        with trio.CancelScope() as self.scope:
+            async with trio.open_nursery() as nursery:
+                server = await nursery.start(lambda task_status: serve_websocket(self.forward, '127.0.0.1', 0, None, max_message_size=self.max_message_size, task_status=task_status))
+                self.proxy_port = server.port
+                self.ready.set()
+
+    async def forward(self, request):
+        client = await request.accept()
+        async with open_websocket_url('ws://127.0.0.1:' + str(self.rpc_port), max_message_size=self.max_message_size) as node:
+            # Id of the submit calls waiting for their answer -> submitted extrinsic
+            submitted = {}
+            async with trio.open_nursery() as nursery:
+
+                async def upstream():
+                    while True:
+                        message = await client.get_message()
+                        call = json.loads(message)
+                        if call.get('method') in self.submit_methods:
+                            submitted[call.get('id')] = call['params'][0]
+                        await node.send_message(message)
+
+                async def downstream():
+                    while True:
+                        message = await node.get_message()
+                        await client.send_message(message)
+                        if submitted:
+                            reply = json.loads(message)
+                            if reply.get('id') in submitted:
+                                extrinsic = submitted.pop(reply['id'])
+                                if 'result' not in reply:
+                                    continue
+                                for listener in self.listeners:
+                                    listener(extrinsic)
+                                if self.instant:
+                                    # The extrinsic is in the pool, seal it without holding the connection
+                                    nursery.start_soon(trio.to_thread.run_sync, self.seal)
+
+                async def pump(direction):
+                    try:
+                        await direction()
+                    except ConnectionClosed:
+                        # Either side went away, which closes the other one
+                        nursery.cancel_scope.cancel()
+
+                nursery.start_soon(pump, upstream)
+                nursery.start_soon(pump, downstream)
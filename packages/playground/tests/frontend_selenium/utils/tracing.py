@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+import importlib
+import threading
+import pkgutil
+import types
+import json
+import time
+import os
+import re
+
+"""
+This module contains the Chrome Trace Event export of the tests, merging the Python side spans with the browser trace.
+"""
+
+# Browser trace categories: main thread tasks, scripts, paints and network loading
+trace_categories = 'devtools.timeline,disabled-by-default-devtools.timeline,v8.execute,blink.user_timing,loading,netlog'
+
+sleep = time.sleep
+
+
+class Tracer:
+
+    # Tracer of the run, set from the '--trace-dir' option
+    current = None
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.test = None
+        self.events = []
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+
+    @staticmethod
+    def now():
+        # Chrome timestamps are microseconds of the monotonic clock, so both sides share one timeline
+        return time.monotonic_ns() / 1000
+
+    def begin(self, test):
+        with self.lock:
+            self.test = test
+            self.events = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': 'pytest ' + test}}]
+
+    def end(self, browser_events=()):
+        with self.lock:
+            test, events = self.test, self.events + list(browser_events)
+            self.test = None
+            self.events = []
+        if test is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, re.sub(r'[^\w.-]+', '_', test) + '.json')
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+        return path
+
+    def complete(self, name, category, start, end, args=None):
+        if self.test is None:
+            return
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start, 'dur': end - start, 'pid': self.pid, 'tid': threading.get_ident(), 'args': args or {}}
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, category, **args):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start, self.now(), args)
+
+
+def traced(function, name, category):
+    def wrapper(*args, **kwargs):
+        tracer = Tracer.current
+        if tracer is None or tracer.test is None:
+            return function(*args, **kwargs)
+        with tracer.span(name, category):
+            return function(*args, **kwargs)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def instrument(cls, category):
+    # Every method of the class opens a span named after it
+    for name, value in list(vars(cls).items()):
+        if isinstance(value, types.FunctionType) and not name.startswith('__') and not hasattr(value, '__wrapped__'):
+            setattr(cls, name, traced(value, cls.__name__ + '.' + name, category))
+
+
+def instrument_pages():
+    import pages
+    for module_info in pkgutil.iter_modules(pages.__path__):
+        module = importlib.import_module('pages.' + module_info.name)
+        for value in list(vars(module).values()):
+            if isinstance(value, type) and value.__module__ == module.__name__:
+                instrument(value, 'page')
+        if vars(module).get('time') is time:
+            # Only the sleeps of the page objects are traced, the time module itself is left alone
+            module.time = traced_time
+
+
+def traced_sleep(seconds):
+    tracer = Tracer.current
+    if tracer is None or tracer.test is None:
+        return sleep(seconds)
+    with tracer.span('sleep', 'sleep', seconds=seconds):
+        return sleep(seconds)
+
+
+# Stands in for the time module in the page modules
+traced_time = types.SimpleNamespace(**{name: getattr(time, name) for name in dir(time) if not name.startswith('_')})
+traced_time.sleep = traced_sleep
+
+
+def trace_events(messages):
+    # chromedriver hands the browser trace over with the performance log
+    events = []
+    for message in messages:
+        if message['method'] == 'Tracing.dataCollected':
+            params = message['params']
+            events.extend(params['value'] if 'value' in params else [params])
+    return events
@@ -5,8 +5,11 @@ import random
 import string
 import os
 import json
+from utils.lease import AccountLease
 
 def get_seed():
+    if (AccountLease.get('seed') != ''):
+        return AccountLease.get('seed')
     config = configparser.ConfigParser()
     config.read('Config.ini')
     seed = config['Utils']['seed']
@@ -19,8 +22,13 @@ def get_seed():
     return str(seed)
 
 def get_node_seed():
+    if (AccountLease.get('node_seed') != ''):
+        return AccountLease.get('node_seed')
     config = configparser.ConfigParser()
     config.read('Config.ini')
+    if (AccountLease.current is not None and config.get('StandIns', 'tfchain', fallback='') != ''):
+        # The configured node twin belongs to the live network, it does not exist on the local chain
+        raise RuntimeError("The leased account has no node_seed on the local TFChain; set 'accounts' with a node_seed of the local chain for each account.")
     seed = config['Utils']['node_seed']
     if (seed == ''):
         try:
@@ -31,6 +39,8 @@ def get_node_seed():
     return str(seed)
 
 def get_stellar_address():
+    if (AccountLease.get('address') != ''):
+        return AccountLease.get('address')
     config = configparser.ConfigParser()
     config.read('Config.ini')
     address = config['Utils']['address']
@@ -43,6 +53,8 @@ def get_stellar_address():
     return str(address)
 
 def get_email():
+    if (AccountLease.get('email') != ''):
+        return AccountLease.get('email')
     config = configparser.ConfigParser()
     config.read('Config.ini')
     email = config['Utils']['email']
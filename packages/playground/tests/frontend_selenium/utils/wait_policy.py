@@ -0,0 +1,107 @@
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import ui
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from utils.base import Base
+from utils.waits import wait_until_settled
+import time
+
+"""
+This module contains the wait policy replacing the implicit wait of the browsers.
+"""
+
+class WaitPolicy:
+
+    # Explicit timeouts of the locators which should not use the default one
+    timeouts = {}
+
+    @classmethod
+    def set_timeout(cls, locator, timeout):
+        cls.timeouts[tuple(locator)] = timeout
+
+    @classmethod
+    def timeout(cls, by, value):
+        return cls.timeouts.get((by, value), Base.element_timeout)
+
+
+class WebDriverWait(ui.WebDriverWait):
+
+    """
+    Explicit wait turning the policy wait of the lookups off while it polls its condition.
+    """
+
+    def polled(self, method, *args):
+        polling = getattr(self._driver, 'polling', None)
+        if polling is None:
+            return method(*args)
+        self._driver.polling = True
+        try:
+            return method(*args)
+        finally:
+            self._driver.polling = polling
+
+    def until(self, method, message=''):
+        return self.polled(super().until, method, message)
+
+    def until_not(self, method, message=''):
+        return self.polled(super().until_not, method, message)
+
+
+class PolicyChrome(webdriver.Chrome):
+
+    """
+    Chrome driver with no implicit wait, waiting explicitly for each locator instead.
+    """
+
+    # Command profiler and tracer the round trips are reported to, if any
+    profiler = None
+    tracer = None
+    # Set by the explicit waits, whose conditions are already polled
+    polling = False
+
+    def execute(self, driver_command, params=None):
+        # Every command, including the ones of the elements, goes through here
+        start = time.perf_counter()
+        began = self.tracer.now() if self.tracer else 0
+        response = None
+        try:
+            response = super().execute(driver_command, params)
+            return response
+        finally:
+            if self.profiler:
+                self.profiler.record(driver_command, params or {}, response, time.perf_counter() - start)
+            if self.tracer:
+                locator = {'using': params['using'], 'value': params['value']} if params and 'using' in params else {}
+                self.tracer.complete(driver_command, 'webdriver', began, self.tracer.now(), locator)
+
+    def find_element(self, by=By.ID, value=None):
+        # Expected conditions are already polled by a WebDriverWait, so a single lookup is enough for them
+        if self.polling:
+            return super().find_element(by, value)
+        timeout = WaitPolicy.timeout(by, value)
+        try:
+            return ui.WebDriverWait(self, timeout, poll_frequency=0.1, ignored_exceptions=[NoSuchElementException]).until(
+                lambda driver: webdriver.Chrome.find_element(driver, by, value))
+        except TimeoutException:
+            raise NoSuchElementException(f"Unable to locate element {value} within {timeout} seconds")
+
+    def find_elements(self, by=By.ID, value=None, settled=False):
+        if settled:
+            # Asked for when an empty or short result is only trusted once the page stopped changing
+            wait_until_settled(self)
+        return super().find_elements(by, value)
+
+
+def assert_absent(browser, locator):
+    # A single lookup once the page is settled, without waiting for the element to show up
+    elements = browser.find_elements(*locator, settled=True)
+    assert len(elements) == 0, f"{locator[1]} is present {len(elements)} time(s)"
+
+
+def expect_not_visible(browser, locator):
+    while True:
+        try:
+            return not any(element.is_displayed() for element in browser.find_elements(*locator, settled=True))
+        except StaleElementReferenceException:
+            # The element was re-rendered while checking it
+            continue
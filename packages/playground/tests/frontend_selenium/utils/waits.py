@@ -0,0 +1,104 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import JavascriptException, TimeoutException
+import time
+
+"""
+This module contains the wait engine blocking until the playground is settled.
+"""
+
+# Counts the fetch and XHR requests in flight, the browser pool installs it on every new document
+network_tracker = """
+    (() => {
+        if (window.__network) return;
+        // The urls of the requests in flight by id, named when the page does not settle
+        const network = window.__network = {pending: 0, last: performance.now(), next: 0, urls: {}};
+        const start = (url) => {
+            const id = network.next++;
+            network.urls[id] = String(url);
+            network.pending++;
+            network.last = performance.now();
+            return id;
+        };
+        const end = (id) => {
+            delete network.urls[id];
+            network.pending = Math.max(0, network.pending - 1);
+            network.last = performance.now();
+        };
+        const fetch = window.fetch;
+        window.fetch = function (resource) {
+            const id = start(resource && resource.url ? resource.url : resource);
+            return fetch.apply(this, arguments).finally(() => end(id));
+        };
+        const open = XMLHttpRequest.prototype.open;
+        XMLHttpRequest.prototype.open = function (method, url) {
+            this.__url = url;
+            return open.apply(this, arguments);
+        };
+        const send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            const id = start(this.__url);
+            this.addEventListener('loadend', () => end(id), {once: true});
+            return send.apply(this, arguments);
+        };
+    })();
+"""
+
+# Vuetify loading indicators, only counted while they are displayed
+loaders = ".v-progress-linear--active, .v-progress-circular--indeterminate, .v-btn--loading, .v-skeleton-loader__bone"
+
+settle_script = network_tracker + """
+    const done = arguments[arguments.length - 1];
+    const root = document.querySelector('#app');
+    const app = root && root.__vue_app__;
+    // Let Vue flush its pending updates, then let the browser render them
+    const tick = app && app._instance ? app._instance.proxy.$nextTick() : Promise.resolve();
+    tick.then(() => requestAnimationFrame(() => done({
+        ready: document.readyState === 'complete',
+        pending: window.__network.pending,
+        requests: Object.values(window.__network.urls),
+        idle: (performance.now() - window.__network.last) / 1000,
+        loaders: Array.from(document.querySelectorAll('""" + loaders + """')).filter(e => e.getClientRects().length).length
+    })));
+"""
+
+
+class settled:
+
+    """
+    An expectation for the page to have no request in flight and no loading indicator for a quiet period.
+    """
+
+    def __init__(self, quiet=0.5):
+        self.quiet = quiet
+        self.since = None
+        self.state = None
+
+    def __call__(self, driver):
+        state = self.state = driver.execute_async_script(settle_script)
+        if not state['ready'] or state['pending'] or state['loaders']:
+            self.since = None
+            return False
+        if self.since is None:
+            self.since = time.time()
+        return min(time.time() - self.since, state['idle']) >= self.quiet
+
+    def describe(self):
+        if self.state is None:
+            return 'the settle script never ran'
+        if not self.state['ready']:
+            return 'the document is still loading'
+        if self.state['pending']:
+            return str(self.state['pending']) + ' request(s) pending: ' + ', '.join(self.state['requests'])
+        if self.state['loaders']:
+            return str(self.state['loaders']) + ' loading indicator(s) displayed'
+        return 'the page kept changing'
+
+
+def wait_until_settled(browser, timeout=30, quiet=0.5):
+    # The quiet period also covers the 250ms debounce of the input validators.
+    # Every caller gets the TimeoutException, naming what kept the page busy
+    condition = settled(quiet)
+    try:
+        WebDriverWait(browser, timeout, poll_frequency=0.1, ignored_exceptions=[JavascriptException]).until(condition)
+    except TimeoutException:
+        raise TimeoutException('The page did not settle within ' + str(timeout) + ' seconds, ' + condition.describe()) from None